@@ -1,3 +1,5 @@
+from pathlib import Path
+from time import strftime
 from typing import List
 
 from rlbot.agents.base_agent import BaseAgent, GameTickPacket, SimpleControllerState
@@ -6,11 +8,19 @@ from rlbot.utils.structures.game_data_struct import GameTickPacket
 from tmcp import TMCPHandler, TMCPMessage
 
 from util.vec import Vec3
-from util.utilities import physics_object, Vector
 
 from policy import base_policy, marujo_strategy
+from policy.planner import Planner
 from tools.drawing import DrawingTool
 from util.game_info import GameInfo
+from util import intercept
+from util import settings
+from util import spans
+from util import deadline
+from util.comms import CommsPump
+from util.shared_world import SharedWorld, segment_name
+from util.car_table import CarTable
+from offline.recorder import PacketRecorder
 
 from policy.macros import ACK, KICKOFF, CLEAR, DEFENSE, UNDEFINED
 
@@ -24,8 +34,6 @@ except:
     print("\n==========================================")
     quit()
 
-RENDERING = True
-
 
 class Captain(BaseAgent):
     def __init__(self, name, team, index):
@@ -33,19 +41,20 @@ class Captain(BaseAgent):
 
     def initialize_agent(self):
 
+        # The ANALYTIC backend compiles / loads its numba kernels in the background, the LUT is used until they're ready
+        intercept.set_backend(settings.ESTIMATE_BACKEND, self.logger.info)
+        deadline.enabled = settings.DEGRADE_UNDER_PRESSURE
+        self._field_info = None
         self.tmcp_handler = TMCPHandler(self)
-        self.info = GameInfo(self.team)
-        self.info.set_mode("soccar")
+        self.comms = CommsPump(self.tmcp_handler, self.matchcomms)
+        self.info = self.new_info()
         self.draw = DrawingTool(self.renderer, self.team)
         self.tick_counter = 0
         self.last_latest_touch_time = 0
-        self.me = physics_object()
-        self.car = None
+        self.cars = CarTable(self.team, self.index) # Per car state of the latest packet
 
         # Assume you're the captain, if you find an index lower than yours, adjust
         self.captain = True
-        self.allies = []
-        self.enemies = []
         self.policy = None
         self.action = None
         self.controls = SimpleControllerState()
@@ -56,10 +65,61 @@ class Captain(BaseAgent):
         self.stance = UNDEFINED
         self.negotiated = False
 
+        self.recorder = None
+        if settings.RECORD_PACKETS:
+            folder = Path(__file__).absolute().parent / "recordings"
+            folder.mkdir(exist_ok=True)
+            self.recorder = PacketRecorder(folder / f"{strftime('%Y%m%d-%H%M%S')}-{self.index}.rlpk",
+                                           metadata={"name": self.name, "team": self.team, "index": self.index})
+
+        # Opened on the first publish / read, by then we know whether we're the captain
+        self.world = SharedWorld(segment_name(self.matchcomms_root, self.team)) if settings.SHARE_WORLD else None
+
+        self.planner = Planner(self.index, self.new_info, self.logger.warning) if settings.PIPELINED_PLANNING else None
+
+        if settings.SPANS:
+            spans.register(Captain, "render", "render")
+            spans.enable(settings.SPANS_SAMPLE_EVERY, root=(Captain, "get_output"))
+
+    def field_info(self):
+        # The field layout doesn't change during a match: fetch it until it's valid, then keep it
+        if self._field_info is None or self._field_info.num_boosts == 0:
+            self._field_info = self.get_field_info()
+        return self._field_info
+
+    def new_info(self):
+        info = GameInfo(self.team)
+        info.set_mode("soccar")
+        info.rolling_predictions = True
+        return info
+
+    def retire(self):
+        self.comms.close()
+        self.logger.info(self.comms.report())
+        if self.world is not None:
+            self.logger.info(self.world.report())
+            self.world.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.planner is not None:
+            self.planner.stop()
+            self.logger.info(self.planner.report())
+        if settings.SPANS:
+            self.logger.info(spans.report())
+        if settings.DEGRADE_UNDER_PRESSURE:
+            self.logger.info(deadline.report())
 
     def get_output(self, packet: GameTickPacket) -> SimpleControllerState:
+        deadline.start_tick()
+
         # Handle the packet
         self.parse_packet(packet)
+        if self.recorder is not None:
+            self.recorder.record(packet, self.field_info())
+
+        # Marujos take the captain's ball prediction and intercepts when they're recent enough
+        if self.world is not None and not self.captain:
+            self.read_world()
 
         # Check if our action needs to change
         self.check_resets(packet)
@@ -67,73 +127,103 @@ class Captain(BaseAgent):
         # Choosing the action: only the captain decides
         if self.captain:
             my_team = [i for i in range(self.info.num_cars) if self.info.cars[i].team == self.team]
-        
-        # Send / Receive TMCP messages
-        self.handle_comms(packet)
 
         # When you're finished with the action or if it has been cancelled or the game has just reset, reconsider team strategy
-        if self.action == None or self.action.finished:
+        reconsider = self.action == None or self.action.finished
+
+        # Send / Receive TMCP messages, once per tick: marujos read their orders before choosing,
+        # captains send theirs once they're decided
+        if not self.captain:
+            self.handle_comms(packet)
+
+        plan = None
+        if reconsider:
+            plan = self.planner.take(self.info, self.stance, self.captain) if self.planner is not None else None
+            if plan is not None:
+                # The plan's GameInfo is the one its action refers to, it becomes ours
+                self.info = plan.info
+                self.info.read_packet(packet, self.field_info())
+
             if self.captain:
-                self.team_actions = base_policy.choose_stance(self.info, self.info.cars[self.index], my_team, self.last_sent)
+                if plan is not None:
+                    self.team_actions = plan.team_actions
+                else:
+                    self.team_actions = base_policy.choose_stance(self.info, self.info.cars[self.index], my_team, self.last_sent)
 
-                # Send actions as captain
-                self.handle_comms(packet)
+        # Send actions as captain
+        if self.captain:
+            self.handle_comms(packet)
 
+        if reconsider:
             # Pick action according to previous orders
-            self.action = marujo_strategy.choose_action(self.info, self.info.cars[self.index], self.stance)
+            if plan is not None:
+                self.action = plan.action
+            else:
+                self.action = marujo_strategy.choose_action(self.info, self.info.cars[self.index], self.stance)
 
         # Execute action
         if self.action is not None:
             self.action.step(self.info.time_delta)
             self.controls = self.action.controls
 
-            if RENDERING:
-                self.renderer.draw_string_3d(self.info.cars[self.index].position + vec3(0,0,10), 2, 2, self.action.name, self.renderer.white())
+        if self.world is not None and self.captain:
+            self.publish_world()
 
-                self.renderer.draw_line_3d(self.info.cars[self.index].position, self.info.ball.position, self.renderer.white())
-                self.renderer.draw_string_3d(self.info.cars[self.index].position + vec3(0,0,-5), 1, 1, f'Speed: {norm(self.info.cars[self.index].velocity):.1f}', self.renderer.white())
-                self.renderer.draw_rect_3d(self.info.ball.position , 8, 8, True, self.renderer.cyan(), centered=True)
-                
-        if RENDERING:
-            self.draw.execute()
+        # Start working out the next decision in the background
+        if self.planner is not None:
+            self.planner.request(packet, self.field_info(), self.stance, self.captain,
+                                 my_team if self.captain else [], self.last_sent)
+
+        if settings.RENDERING and not deadline.degraded(deadline.SKIP_RENDERING):
+            self.render()
 
+        deadline.end_tick()
         return self.controls
 
+    def read_world(self):
+        try:
+            self.world.read(self.info)
+        except OSError as e:
+            self.logger.warning(f"No shared world, every car predicts on its own: {e}")
+            self.world = None
+
+    def publish_world(self):
+        try:
+            self.world.publish(self.info)
+        except OSError as e:
+            self.logger.warning(f"No shared world, every car predicts on its own: {e}")
+            self.world = None
+
+    def render(self):
+        if self.action is not None:
+            self.renderer.draw_string_3d(self.info.cars[self.index].position + vec3(0,0,10), 2, 2, self.action.name, self.renderer.white())
+
+            self.renderer.draw_line_3d(self.info.cars[self.index].position, self.info.ball.position, self.renderer.white())
+            self.renderer.draw_string_3d(self.info.cars[self.index].position + vec3(0,0,-5), 1, 1, f'Speed: {norm(self.info.cars[self.index].velocity):.1f}', self.renderer.white())
+            self.renderer.draw_rect_3d(self.info.ball.position , 8, 8, True, self.renderer.cyan(), centered=True)
+
+        if settings.SPANS_OVERLAY:
+            spans.draw(self.draw)
+
+        self.draw.execute()
+
     def parse_packet(self, packet):
         """ Updates information about the cars in the game from a given packet. Location, velocity, rotation and boost level. 
             Also useful to keep everyone in check with who the captain is.
         """
-        self.info.read_packet(packet, self.get_field_info())
+        self.info.read_packet(packet, self.field_info())
         self.ball_location = Vec3(packet.game_ball.physics.location)
 
-        for i in range(packet.num_cars):
-            car = packet.game_cars[i]
+        # Every car's location, velocity, rotation and boost, in place
+        self.cars.update(packet)
 
-            # Checking who the captain is
-            if self.captain and i < self.index and car.team == self.team:
+        # Checking who the captain is
+        if self.captain:
+            captain = self.cars.first_teammate_before(self.index)
+            if captain is not None:
                 self.captain = False
-                self.logger.info("Just got demoted.. captain now is " + str(i))
-                self.tmcp_handler.send_boost_action(ACK)
-
-            # Fetching relevant information about every car
-            _obj = physics_object()
-            _obj.index = i
-            _obj.team = car.team
-            _obj.location = Vector([car.physics.location.x, car.physics.location.y, car.physics.location.z])
-            _obj.velocity = Vector([car.physics.velocity.x, car.physics.velocity.y, car.physics.velocity.z])
-            _obj.rotation = Vector([car.physics.rotation.pitch, car.physics.rotation.yaw, car.physics.rotation.roll])
-            _obj.avelocity = Vector([car.physics.angular_velocity.x, car.physics.angular_velocity.y, car.physics.angular_velocity.z])
-            _obj.boostLevel = car.boost
-            #_obj.local_location = localizeVector(_obj,self.me)
-
-            if i != self.index:
-                if car.team == self.team:
-                    self.allies.append(_obj)
-                else:
-                    self.enemies.append(_obj)
-            else:
-                self.me = _obj
-                self.car = packet.game_cars[i]
+                self.logger.info("Just got demoted.. captain now is " + str(captain))
+                self.comms.send(TMCPMessage.boost_action(self.team, self.index, ACK))
 
     def handle_comms(self, packet):
         """ Responsible for handling the TMCP packets sent in the previous iteration.
@@ -145,6 +235,8 @@ class Captain(BaseAgent):
 
         # Decide what to do with your mateys
         if self.captain:
+            self.comms.poll() # Marujos only ACK, nothing to act on
+
             for index in self.team_actions:
                 if index in self.last_sent and self.last_sent[index] == self.team_actions[index] and self.last_sent[index] != KICKOFF:
                     continue
@@ -155,28 +247,27 @@ class Captain(BaseAgent):
                     self.stance = message.target
 
                 else:
-                    succ = self.tmcp_handler.send(message)
-                    if not succ:
-                        self.logger.warn("Failed to send message to" + str(index))
+                    # Queued, goes out as soon as the TMCP rate limit allows
+                    self.comms.send(message)
 
                 self.last_sent[index] = self.team_actions[index]
 
 
         # Check if there are new orders
         else:
-            # Receive and parse all new matchcomms messages into TMCPMessage objects.
-            while True:
-                new_messages: List[TMCPMessage] = self.tmcp_handler.recv()
-
-                # Handle TMCPMessages, which for marujos is pretty much just updating stance.
-                for message in new_messages:
-                    if message.index == self.index and message.team == self.team:
-                        if not (packet.game_info.is_kickoff_pause and message.target not in [KICKOFF, DEFENSE]):
-                            self.stance = message.target
-
-                if self.stance != UNDEFINED:
-                    self.negotiated = True
-                    break
+            # Only what has arrived by now, we keep the last stance until new orders come in
+            new_messages: List[TMCPMessage] = self.comms.poll()
+
+            # Handle TMCPMessages, which for marujos is pretty much just updating stance.
+            for message in new_messages:
+                if message.index == self.index and message.team == self.team:
+                    if not (packet.game_info.is_kickoff_pause and message.target not in [KICKOFF, DEFENSE]):
+                        self.stance = message.target
+
+            if self.stance != UNDEFINED:
+                self.negotiated = True
+
+        self.comms.flush()
 
     def check_resets(self, packet):
 
@@ -0,0 +1,125 @@
+"""
+Microbenchmarks of the bot's hot functions, runnable without a game client.
+
+Benchmarks are registered with the @benchmark decorator in the modules of this package: the decorated function
+does the setup (synthetic inputs) and returns the zero argument callable to time. Run them with
+python -m benchmarks from the Captain folder (see benchmarks/__main__.py for the options).
+"""
+import importlib
+import json
+import pkgutil
+import platform
+import time
+from timeit import Timer
+
+FPS = 120
+TICK_BUDGET = 1 / FPS
+
+BENCHMARKS = {}
+
+
+class Benchmark:
+    def __init__(self, name, setup, calls):
+        self.name = name
+        self.setup = setup
+        self.calls = calls # calls of the hot function per run, e.g. the batch size
+
+    def run(self, min_time=0.2, repeat=5) -> dict:
+        function = self.setup()
+        function() # warm up (JIT compilation, caches)
+
+        # Enough runs per repeat for each repeat to take at least min_time / repeat
+        timer = Timer(function)
+        number = 1
+        while timer.timeit(number) < min_time / repeat:
+            number *= 2
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+        return {
+            "ns_per_call": best / self.calls * 1e9,
+            "calls": self.calls,
+            "seconds_per_run": best,
+            "budget_percent": best / TICK_BUDGET * 100,
+        }
+
+
+def benchmark(name, calls=1):
+    """Register the decorated setup function as the benchmark name"""
+    def decorator(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, calls)
+        return setup
+    return decorator
+
+
+def discover():
+    """Import every benchmark module of this package, which registers their benchmarks"""
+    for module in pkgutil.iter_modules(__path__):
+        if not module.name.startswith("_") and module.name != "inputs":
+            importlib.import_module(f"{__name__}.{module.name}")
+    return BENCHMARKS
+
+
+def run(patterns=(), min_time=0.2, repeat=5, log=print) -> dict:
+    """Run the benchmarks whose name contains any of patterns (all of them if empty)"""
+    discover()
+    results = {}
+    for name, bench in sorted(BENCHMARKS.items()):
+        if patterns and not any(pattern in name for pattern in patterns):
+            continue
+        try:
+            results[name] = bench.run(min_time, repeat)
+        except Exception as e: # e.g. rlutilities or numba not available here
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+        if log is not None:
+            log(format_result(name, results[name]))
+
+    return {
+        "meta": {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+
+
+def format_result(name, result) -> str:
+    if "skipped" in result:
+        return f"{name:<48} skipped ({result['skipped']})"
+    return (f"{name:<48} {result['ns_per_call']:>12.1f} ns/call x {result['calls']:<6} "
+            f"{result['budget_percent']:>9.4f} % of our time budget")
+
+
+def save(report, path):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+
+
+def load(path) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(old, new, threshold=0.1, log=print) -> list:
+    """Print the ns/call of both reports side by side, return the names that got slower by more than threshold"""
+    regressions = []
+    old_results, new_results = old["results"], new["results"]
+
+    for name in sorted(set(old_results) | set(new_results)):
+        before, after = old_results.get(name, {}), new_results.get(name, {})
+        if "ns_per_call" not in before or "ns_per_call" not in after:
+            timed = [run for run, result in (("old", before), ("new", after)) if "ns_per_call" in result]
+            log(f"{name:<48} {'only timed in the ' + timed[0] + ' run' if timed else 'skipped'}")
+            continue
+
+        ratio = after["ns_per_call"] / before["ns_per_call"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  <-- slower"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        log(f"{name:<48} {before['ns_per_call']:>12.1f} -> {after['ns_per_call']:>12.1f} ns/call ({ratio:.2f}x){flag}")
+
+    return regressions
@@ -0,0 +1,40 @@
+"""
+python -m benchmarks [pattern ...] [--json results.json] [--compare baseline.json] [--min-time 0.2] [--repeat 5]
+
+Runs the registered benchmarks (only those whose name contains one of the patterns, if any), optionally saving
+the results as JSON and diffing them against a previous run.
+"""
+import argparse
+import sys
+
+import benchmarks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Microbenchmarks of the hot functions")
+    parser.add_argument("patterns", nargs="*", help="only run benchmarks whose name contains one of these")
+    parser.add_argument("--json", help="save the results to this file")
+    parser.add_argument("--compare", help="diff the results against this earlier --json file")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent timing each benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="repeats per benchmark, the best one is kept")
+    parser.add_argument("--list", action="store_true", help="list the registered benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, bench in sorted(benchmarks.discover().items()):
+            print(f"{name} ({bench.calls} calls per run)")
+        return 0
+
+    report = benchmarks.run(args.patterns, args.min_time, args.repeat)
+
+    if args.json:
+        benchmarks.save(report, args.json)
+    if args.compare:
+        print()
+        regressions = benchmarks.compare(benchmarks.load(args.compare), report)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import numpy as np
+
+from benchmarks import benchmark
+from benchmarks import inputs
+
+
+@benchmark("boost_utils.closest_available_boost", calls=1)
+def closest_available_boost():
+    from util.boost_utils import closest_available_boost
+    pads = inputs.boost_pads()
+    location = np.array([1000.0, -2000.0, 17.0])
+    return lambda: closest_available_boost(location, pads)
+
+
+@benchmark("boost_utils.available_boost_pads", calls=1)
+def available_boost_pads():
+    from util.boost_utils import available_boost_pads
+    pads = inputs.boost_pads()
+    location = np.array([1000.0, -2000.0, 17.0])
+    return lambda: available_boost_pads(location, pads)
+
+
+@benchmark("path_finder.find_fastest_path", calls=1)
+def find_fastest_path():
+    from util.path_finder import find_fastest_path
+    pads = inputs.boost_pads()[:5].copy()
+    start, target = pads["location"][3].copy(), pads["location"][4].copy()
+    velocity = np.array([0.0, 500.0, 0.0])
+    target_direction = np.array([0.0, 1.0, 0.0])
+    return lambda: find_fastest_path(pads[:3], start, target, velocity, 50.0, target_direction)
+
+
+@benchmark("path_finder.optional_boost_target", calls=1)
+def optional_boost_target():
+    from util.path_finder import optional_boost_target
+    pads = inputs.boost_pads()
+    start, target = np.array([0.0, -4000.0, 17.0]), np.array([0.0, 3000.0, 93.0])
+    velocity = np.array([0.0, 500.0, 0.0])
+    return lambda: optional_boost_target(pads, start, target, velocity, 20.0)
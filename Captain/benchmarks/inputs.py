@@ -0,0 +1,54 @@
+"""Synthetic inputs for the benchmarks, so they can run without a game client"""
+import numpy as np
+
+from util.arena import BOOST_PADS
+from util.dtypes import dtype_full_boost
+
+SEED = 0
+
+
+def rng():
+    return np.random.default_rng(SEED)
+
+
+def drive_states(n, generator=None):
+    """(distance, initial velocity, boost amount) arrays covering the ranges the drive_1d solvers see"""
+    generator = generator or rng()
+    return generator.uniform(0, 6000, n), generator.uniform(-2300, 2300, n), generator.uniform(0, 100, n)
+
+
+def drive_times(n, generator=None):
+    generator = generator or rng()
+    return generator.uniform(0, 6, n)
+
+
+def boost_pads(generator=None) -> np.ndarray:
+    """Standard pad layout with a random half of the pads taken"""
+    generator = generator or rng()
+    pads = np.zeros(len(BOOST_PADS), dtype=dtype_full_boost)
+    pads["location"] = [(x, y, z) for x, y, z, _ in BOOST_PADS]
+    pads["is_full_boost"] = [full for _, _, _, full in BOOST_PADS]
+    pads["is_active"] = generator.random(len(pads)) > 0.5
+    pads["timer"] = np.where(pads["is_active"], 0, generator.uniform(0, 4, len(pads)))
+    return pads
+
+
+def field_locations(n, generator=None):
+    generator = generator or rng()
+    return np.stack([generator.uniform(-4000, 4000, n), generator.uniform(-5000, 5000, n),
+                     generator.uniform(17, 1500, n)], axis=1)
+
+
+def car_rows(n, generator=None):
+    """Rows of cars as taken by the numba arrival time kernels (see util.physics.arrival_time)"""
+    from util.physics.arrival_time import CAR_POSITION, CAR_FORWARD, CAR_SPEED, CAR_BOOST, CAR_TURNING_RADIUS
+
+    generator = generator or rng()
+    angle = generator.uniform(-np.pi, np.pi, n)
+    rows = np.zeros((n, 9))
+    rows[:, CAR_POSITION] = field_locations(n, generator) * [1, 1, 0] + [0, 0, 17]
+    rows[:, CAR_FORWARD] = np.stack([np.cos(angle), np.sin(angle), np.zeros(n)], axis=1)
+    rows[:, CAR_SPEED] = generator.uniform(0, 2300, n)
+    rows[:, CAR_BOOST] = generator.uniform(0, 100, n)
+    rows[:, CAR_TURNING_RADIUS] = generator.uniform(150, 1200, n)
+    return rows
@@ -0,0 +1,103 @@
+from benchmarks import benchmark
+from benchmarks import inputs
+
+N_CARS = 6
+N_SLICES = 600
+
+
+def _game():
+    # Cars and a ball trajectory built with rlutilities, without a game client
+    from rlutilities.linear_algebra import vec3
+    from rlutilities.simulation import Ball, Car
+    from util.ball_trajectory import BallTrajectory
+
+    generator = inputs.rng()
+    ball = Ball()
+    ball.position = vec3(0, 0, 1000)
+    ball.velocity = vec3(800, 1200, 500)
+    trajectory = BallTrajectory()
+    for _ in range(N_SLICES):
+        ball.step(1 / 120)
+        trajectory.append(ball)
+
+    cars = []
+    for x, y, _ in inputs.field_locations(N_CARS, generator):
+        car = Car()
+        car.position = vec3(x, y, 17)
+        car.velocity = vec3(*generator.uniform(-1000, 1000, 2), 0)
+        car.boost = int(generator.integers(0, 101))
+        cars.append(car)
+
+    return cars, trajectory
+
+
+def _estimate_times_for_cars(backend):
+    from util import intercept
+
+    cars, trajectory = _game()
+    targets = trajectory.position[::3]
+    intercept.set_backend(backend)
+    if backend == intercept.ANALYTIC:
+        intercept.warmup.start().join()
+    return lambda: intercept.ESTIMATE_TIMES_FOR_CARS[backend](cars, targets)
+
+
+@benchmark("intercept.estimate_times_for_cars_lut", calls=N_CARS * N_SLICES // 3)
+def estimate_times_for_cars_lut():
+    return _estimate_times_for_cars("lut")
+
+
+@benchmark("intercept.estimate_times_for_cars_table", calls=N_CARS * N_SLICES // 3)
+def estimate_times_for_cars_table():
+    return _estimate_times_for_cars("table")
+
+
+@benchmark("intercept.estimate_times_for_cars_analytic", calls=N_CARS * N_SLICES // 3)
+def estimate_times_for_cars_analytic():
+    return _estimate_times_for_cars("analytic")
+
+
+@benchmark("intercept.estimate_time_lut", calls=1)
+def estimate_time_lut():
+    from util.intercept import estimate_time_lut
+    cars, trajectory = _game()
+    return lambda: estimate_time_lut(cars[0], trajectory[300].position)
+
+
+def scalar_intercept(car, ball_predictions):
+    """The intercept search before it was vectorized: one estimate_time call per checked slice"""
+    from util.intercept import estimate_time
+
+    for i in range(0, len(ball_predictions), 3):
+        ball = ball_predictions[i]
+        if estimate_time(car, ball.position) < ball.time - car.time:
+            return ball
+    return ball_predictions[-1]
+
+
+def _intercept_search(search, num_cars):
+    def setup():
+        from util import intercept
+        cars, trajectory = _game()
+        intercept.set_backend(intercept.LUT)
+        search_function = search or intercept.Intercept
+        return lambda: [search_function(car, trajectory) for car in cars[:num_cars]]
+    return setup
+
+
+# Scalar vs vectorized search for 1, 3 and 6 cars (see util/intercept.py main() for the speedups)
+INTERCEPT_CARS = (1, 3, 6)
+for _num_cars in INTERCEPT_CARS:
+    benchmark(f"intercept.Intercept_scalar_{_num_cars}_cars", calls=_num_cars)(
+        _intercept_search(scalar_intercept, _num_cars))
+    benchmark(f"intercept.Intercept_vectorized_{_num_cars}_cars", calls=_num_cars)(
+        _intercept_search(None, _num_cars))
+
+
+@benchmark("intercept.ReachabilityMatrix", calls=N_CARS)
+def reachability_matrix():
+    from util import intercept
+    from util.intercept import ReachabilityMatrix
+    cars, trajectory = _game()
+    intercept.set_backend(intercept.LUT)
+    return lambda: ReachabilityMatrix(cars, trajectory)
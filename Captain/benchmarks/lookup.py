@@ -0,0 +1,32 @@
+from benchmarks import benchmark
+from benchmarks import inputs
+
+N = 1200 # 6 cars x 200 prediction slices
+
+
+@benchmark("acceleration_lut.simulate_until_limit", calls=1)
+def simulate_until_limit():
+    from util.lookup_data.acceleration_lut import BOOST
+    return lambda: BOOST.simulate_until_limit(500.0, distance_limit=1500.0, time_limit=2.0)
+
+
+@benchmark("acceleration_lut.simulate_until_limit_vectorized", calls=N)
+def simulate_until_limit_vectorized():
+    from util.lookup_data.acceleration_lut import BOOST
+    distance, velocity, boost = inputs.drive_states(N)
+    return lambda: BOOST.simulate_until_limit_vectorized(velocity, distance_limit=distance, time_limit=boost / 33.33)
+
+
+@benchmark("arrival_time_table.time", calls=1)
+def arrival_time():
+    from util.lookup_data.arrival_time_table import arrival_times
+    table = arrival_times()
+    return lambda: table.time(1500.0, 500.0, 50.0)
+
+
+@benchmark("arrival_time_table.time_vectorized", calls=N)
+def arrival_time_vectorized():
+    from util.lookup_data.arrival_time_table import arrival_times
+    table = arrival_times()
+    distance, velocity, boost = inputs.drive_states(N)
+    return lambda: table.time_vectorized(distance, velocity, boost)
@@ -0,0 +1,106 @@
+import numpy as np
+
+from benchmarks import benchmark
+from benchmarks import inputs
+
+N = 360 # batch size of the old module timers
+
+
+@benchmark("drive_1d_distance.state_at_distance", calls=1)
+def state_at_distance():
+    from util.physics.drive_1d_distance import state_at_distance
+    return lambda: state_at_distance(1000.0, 500.0, 50.0)
+
+
+@benchmark("drive_1d_distance.state_at_distance_vectorized", calls=N)
+def state_at_distance_vectorized():
+    from util.physics.drive_1d_distance import state_at_distance_vectorized
+    distance, velocity, boost = inputs.drive_states(N)
+    return lambda: state_at_distance_vectorized(distance, velocity, boost)
+
+
+@benchmark("drive_1d_time.state_at_time_vectorized", calls=N)
+def state_at_time_vectorized():
+    from util.physics.drive_1d_time import state_at_time_vectorized
+    _, velocity, boost = inputs.drive_states(N)
+    time = inputs.drive_times(N)
+    return lambda: state_at_time_vectorized(time, velocity, boost)
+
+
+@benchmark("drive_1d_velocity.state_at_velocity_vectorized", calls=N)
+def state_at_velocity_vectorized():
+    from util.physics.drive_1d_velocity import state_at_velocity_vectorized
+    _, velocity, boost = inputs.drive_states(N)
+    return lambda: state_at_velocity_vectorized(-velocity, velocity, boost)
+
+
+@benchmark("drive_1d_simulation.state_at_distance_simulation_vectorized", calls=N)
+def state_at_distance_simulation_vectorized():
+    from util.physics.drive_1d_simulation import state_at_distance_simulation_vectorized
+    distance, velocity, boost = inputs.drive_states(N)
+    return lambda: state_at_distance_simulation_vectorized(distance, velocity, boost)
+
+
+@benchmark("drive_1d_simulation.state_at_time_simulation_vectorized", calls=N)
+def state_at_time_simulation_vectorized():
+    from util.physics.drive_1d_simulation import state_at_time_simulation_vectorized
+    _, velocity, boost = inputs.drive_states(N)
+    time = inputs.drive_times(N)
+    return lambda: state_at_time_simulation_vectorized(time, velocity, boost)
+
+
+@benchmark("drive_1d_simulation.state_at_velocity_simulation_vectorized", calls=N)
+def state_at_velocity_simulation_vectorized():
+    from util.physics.drive_1d_simulation import state_at_velocity_simulation_vectorized
+    _, velocity, boost = inputs.drive_states(N)
+    return lambda: state_at_velocity_simulation_vectorized(-velocity, velocity, boost)
+
+
+@benchmark("drive_1d.batch_distance", calls=N)
+def batch_distance():
+    from util.physics import drive_1d
+    distance, velocity, boost = inputs.drive_states(N)
+    out = np.empty((4, N))
+    return lambda: drive_1d.batch("distance", distance, velocity, boost, out=out)
+
+
+@benchmark("drive_1d.batch_distance_large", calls=100000)
+def batch_distance_large():
+    from util.physics import drive_1d
+    distance, velocity, boost = inputs.drive_states(100000)
+    out = np.empty((4, 100000))
+    return lambda: drive_1d.batch("distance", distance, velocity, boost, out=out)
+
+
+@benchmark("arrival_time.estimate_times_vectorized", calls=6 * 200)
+def estimate_times_vectorized():
+    from util.physics.arrival_time import estimate_times_vectorized
+    cars = inputs.car_rows(6)
+    targets = inputs.field_locations(200)
+    return lambda: estimate_times_vectorized(cars, targets)
+
+
+@benchmark("special_lambertw.lambertw", calls=N)
+def lambertw():
+    from util.special_lambertw import lambertw, EXPN1
+    return _jit_loop(lambertw, np.linspace(-EXPN1, 0, N, endpoint=False))
+
+
+@benchmark("special_lambertw.lambertw_real", calls=N)
+def lambertw_real():
+    from util.special_lambertw import lambertw_real, EXPN1
+    return _jit_loop(lambertw_real, np.linspace(-EXPN1, 0, N, endpoint=False))
+
+
+def _jit_loop(function, values):
+    # Scalar numba functions are called from other numba code, so time them inside a jitted loop
+    from numba import njit
+
+    @njit
+    def loop(values):
+        total = 0.0
+        for value in values:
+            total += function(value)
+        return total
+
+    return lambda: loop(values)
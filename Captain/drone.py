@@ -0,0 +1,10 @@
+from pathlib import Path
+
+from rlbot.agents.hivemind.drone_agent import DroneAgent
+
+
+class CaptainDrone(DroneAgent):
+    # Every Captain car of a team is driven by a single CaptainHivemind process (see hivemind.py)
+    hive_path = str(Path(__file__).absolute().parent / "hivemind.py")
+    hive_key = "CaptainHive"
+    hive_name = "Captain Hivemind"
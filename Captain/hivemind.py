@@ -0,0 +1,120 @@
+"""
+Team hosting: one process runs every Captain car of a team, through RLBot's hivemind (drone.py, hivemind.cfg).
+
+The cars share one GameInfo, so the packet is read, the ball predicted and the reachability matrix computed once per
+tick for the whole team instead of once per car, and the captain's stances reach the marujos directly instead of
+going over TMCP. The per car logic is the same as Captain.get_output.
+"""
+from typing import Dict
+
+from rlbot.agents.hivemind.python_hivemind import PythonHivemind
+from rlbot.utils.structures.bot_input_struct import PlayerInput
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from rlutilities.linear_algebra import vec3
+
+from policy import base_policy, marujo_strategy
+from policy.macros import CLEAR, UNDEFINED
+from util.game_info import GameInfo
+from util import intercept
+from util import deadline
+from util import settings
+
+
+class Drone:
+    """What Captain keeps per car, for one car of the hive"""
+
+    def __init__(self, index):
+        self.index = index
+        self.stance = UNDEFINED
+        self.action = None
+        self.last_latest_touch_time = 0
+        self.output = PlayerInput()
+
+
+class CaptainHivemind(PythonHivemind):
+
+    def initialize_hive(self, packet: GameTickPacket) -> None:
+        intercept.set_backend(settings.ESTIMATE_BACKEND, self.logger.info)
+        deadline.enabled = settings.DEGRADE_UNDER_PRESSURE
+
+        self.info = GameInfo(self.team)
+        self.info.set_mode("soccar")
+        self.info.rolling_predictions = True
+
+        # The lowest index is the captain, like in separate processes
+        self.drones = {index: Drone(index) for index in sorted(self.drone_indices)}
+        self.captain = min(self.drones)
+        self.team_actions = {}
+        self.kickoff_pause = False
+
+    def get_outputs(self, packet: GameTickPacket) -> Dict[int, PlayerInput]:
+        deadline.start_tick()
+        self.info.read_packet(packet, self.get_field_info())
+        self.check_resets(packet)
+
+        # The captain decides for everyone when its own action is done
+        captain = self.drones[self.captain]
+        if captain.action is None or captain.action.finished:
+            self.team_actions = base_policy.choose_stance(self.info, self.info.cars[self.captain], list(self.drones),
+                                                          self.team_actions)
+            for index, stance in self.team_actions.items():
+                self.drones[index].stance = stance
+
+        for drone in self.drones.values():
+            if drone.action is None or drone.action.finished:
+                drone.action = marujo_strategy.choose_action(self.info, self.info.cars[drone.index], drone.stance)
+
+            if drone.action is not None:
+                drone.action.step(self.info.time_delta)
+                self.write_output(drone.action.controls, drone.output)
+
+        if settings.RENDERING and not deadline.degraded(deadline.SKIP_RENDERING):
+            self.render()
+
+        deadline.end_tick()
+        return {index: drone.output for index, drone in self.drones.items()}
+
+    @staticmethod
+    def write_output(controls, output):
+        output.throttle = controls.throttle
+        output.steer = controls.steer
+        output.pitch = controls.pitch
+        output.yaw = controls.yaw
+        output.roll = controls.roll
+        output.jump = controls.jump
+        output.boost = controls.boost
+        output.handbrake = controls.handbrake
+        output.use_item = controls.use_item
+
+    def check_resets(self, packet):
+        # Same resets as Captain.check_resets, for every drone
+
+        # Everyone drops what they're doing when a kickoff starts, the captain hands out new stances
+        if packet.game_info.is_kickoff_pause and not self.kickoff_pause:
+            for drone in self.drones.values():
+                drone.action = None
+        self.kickoff_pause = packet.game_info.is_kickoff_pause
+
+        touch = packet.game_ball.latest_touch
+        for drone in self.drones.values():
+            # reset action when another car hits the ball (unless we're dodging, wavedashing or recovering)
+            if touch.time_seconds > drone.last_latest_touch_time and touch.player_name != packet.game_cars[drone.index].name:
+                drone.last_latest_touch_time = touch.time_seconds
+                if drone.action and drone.action.interruptible():
+                    drone.action = None
+                    continue
+
+            # clear if the ball is entering the danger zone
+            dangerous = marujo_strategy.danger(self.info, self.info.cars[drone.index])
+            if dangerous and drone.stance != CLEAR and drone.action and drone.action.interruptible():
+                drone.stance = CLEAR
+                drone.action = None
+
+    def render(self):
+        self.renderer.begin_rendering("hivemind")
+        for drone in self.drones.values():
+            if drone.action is not None:
+                car = self.info.cars[drone.index]
+                self.renderer.draw_string_3d(car.position + vec3(0, 0, 10), 2, 2, drone.action.name, self.renderer.white())
+        self.renderer.end_rendering()
@@ -0,0 +1,266 @@
+"""
+Offline driver: runs Captain or Primus on recorded (offline.recorder) or synthetic (offline.packets) packets,
+with the renderer, matchcomms and field info stubbed, and reports the latency of every get_output call.
+
+From the Captain folder:
+    python -m offline.driver captain --scenario kickoff --team-size 3 --ticks 3600
+    python -m offline.driver primus --replay recordings/match.rlpk --indices 0 1 --pace
+    python -m offline.driver captain-hive --scenario open_play --team-size 3 --indices 0 1 2
+
+Packets are fed as fast as possible unless --pace is given (120 Hz, like a live match). Slow ticks are reported
+together with the play / policy branch the agent was in at the time.
+"""
+import argparse
+import os
+import queue
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from time import perf_counter, sleep
+
+import numpy as np
+from rlbot.agents.hivemind.python_hivemind import PythonHivemind
+
+from offline.packets import PacketGenerator, StubRenderer, scenario, SCENARIOS, FPS
+from offline.recorder import Replay
+from util import spans
+
+BUDGET = 1 / FPS
+ROOT = Path(__file__).absolute().parent.parent.parent
+
+
+def _captain_describe(agent):
+    from policy import macros
+    stances = {value: name for name, value in vars(macros).items() if name.isupper()}
+    action = agent.action.name if agent.action is not None else None
+    return f"{stances.get(agent.stance, agent.stance)}: {action}"
+
+
+def _captain_ready(agent):
+    # Time the steady state, not the numba warm-up (only the ANALYTIC backend has one)
+    from util import intercept
+    if intercept.BACKEND == intercept.ANALYTIC:
+        intercept.warmup.start().join()
+
+
+def _hive_describe(hive):
+    # Branch of the hive's captain
+    from policy import macros
+    stances = {value: name for name, value in vars(macros).items() if name.isupper()}
+    drone = hive.hive.drones[hive.hive.captain]
+    action = drone.action.name if drone.action is not None else None
+    return f"{stances.get(drone.stance, drone.stance)}: {action}"
+
+
+def _primus_describe(agent):
+    play = agent.play.name if agent.play is not None else None
+    return f"{agent.objective}: {play}"
+
+
+# name -> (folder to import from, module, agent class, describe(agent) -> active branch, ready(agent) or None)
+BOTS = {
+    "captain": (ROOT / "Captain", "Captain", "Captain", _captain_describe, _captain_ready),
+    "captain-hive": (ROOT / "Captain", "hivemind", "CaptainHivemind", _hive_describe, _captain_ready),
+    "primus": (ROOT / "Primus" / "src", "bot", "Primus", _primus_describe, None),
+}
+
+
+def load_bot(name):
+    """Import the agent class of the bot, making its folder the first one on the path"""
+    folder, module, class_name, describe, ready = BOTS[name]
+
+    # Captain and Primus both have top level util / plays packages: drop whatever was imported before
+    # (the offline modules only needed Captain's util.arena, which they've already read).
+    # util.spans stays, it looks its targets up by module name on enable() so it can instrument either bot
+    if str(folder) != sys.path[0]:
+        for loaded in [loaded for loaded in sys.modules if loaded.split(".")[0] in ("util", "plays", "policy")]:
+            if loaded != "util.spans":
+                del sys.modules[loaded]
+        sys.path.insert(0, str(folder))
+
+    agent_class = getattr(__import__(module), class_name)
+    return agent_class, describe, ready
+
+
+class LocalMatchcomms:
+    """In process stand-in for the matchcomms server: a broadcast reaches every other client"""
+
+    def __init__(self):
+        self.clients = []
+
+    def client(self):
+        client = _MatchcommsClient(self)
+        self.clients.append(client)
+        return client
+
+
+class _MatchcommsClient:
+    def __init__(self, broker):
+        self.incoming_broadcast = queue.Queue()
+        self.outgoing_broadcast = _Broadcast(broker, self)
+
+    def close(self):
+        pass
+
+
+class _Broadcast:
+    def __init__(self, broker, sender):
+        self.broker = broker
+        self.sender = sender
+
+    def put_nowait(self, message):
+        for client in self.broker.clients:
+            if client is not self.sender:
+                client.incoming_broadcast.put_nowait(message)
+
+    put = put_nowait
+
+
+def make_agent(agent_class, packet, index, field_info, matchcomms):
+    """Create and initialize an agent like the RLBot framework would, with stubs instead of the game"""
+    car = packet.game_cars[index]
+    agent = agent_class(car.name or f"bot{index}", car.team, index)
+    agent._set_renderer(StubRenderer())
+    agent._register_field_info(lambda: field_info)
+    agent._register_quick_chat(lambda *args: None)
+    agent.matchcomms_root = f"local-{os.getpid()}" # unique per run, like the real matchcomms address per match
+    agent._matchcomms = matchcomms.client()
+    agent.initialize_agent()
+    return agent
+
+
+class HiveAgent:
+    """Runs a PythonHivemind like RLBot would, as a single agent whose get_output drives all of its drones"""
+
+    def __init__(self, hive_class, packet, indices, field_info):
+        self.hive = hive_class(queue.Queue(), threading.Event(), {"name": hive_class.__name__})
+        self.hive.drone_indices = set(indices)
+        self.hive._field_info = field_info
+        self.hive.team = packet.game_cars[min(indices)].team
+        self.hive.renderer = StubRenderer()
+        self.hive.initialize_hive(packet)
+        self.index = min(indices)
+
+    def get_output(self, packet):
+        return self.hive.get_outputs(packet)
+
+    def retire(self):
+        if hasattr(self.hive, "retire"):
+            self.hive.retire()
+
+
+class TickStats:
+    def __init__(self):
+        self.latencies = [] # seconds per get_output call, all agents
+        self.branches = Counter() # active branch -> ticks
+        self.slow_branches = Counter() # active branch -> ticks over budget
+        self.slowest = [] # (seconds, tick, index, branch)
+
+    def add(self, tick, index, seconds, branch):
+        self.latencies.append(seconds)
+        self.branches[branch] += 1
+        if seconds > BUDGET:
+            self.slow_branches[branch] += 1
+            self.slowest.append((seconds, tick, index, branch))
+
+    def report(self, top=10) -> str:
+        latencies = np.array(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        over = len(self.slowest)
+
+        lines = [f"{len(latencies)} get_output calls: p50 {p50:.3f} ms, p95 {p95:.3f} ms, p99 {p99:.3f} ms, "
+                 f"max {latencies.max():.3f} ms",
+                 f"{over} ({over / len(latencies) * 100:.2f} %) over the {BUDGET * 1000:.2f} ms budget"]
+        if over:
+            lines.append("Active branch on slow ticks (slow / all ticks in that branch):")
+            lines += [f"    {branch}: {count} / {self.branches[branch]}"
+                      for branch, count in self.slow_branches.most_common(top)]
+            lines.append("Slowest ticks:")
+            lines += [f"    tick {tick} (index {index}): {seconds * 1000:.3f} ms in {branch}"
+                      for seconds, tick, index, branch in sorted(self.slowest, reverse=True)[:top]]
+        return "\n".join(lines)
+
+
+def drive(agents, packets, describe, pace=False) -> TickStats:
+    """Feed every packet to every agent (lowest index first, so captains give their orders first)"""
+    stats = TickStats()
+    deadline = perf_counter()
+
+    for tick, packet in enumerate(packets):
+        for agent in agents:
+            start = perf_counter()
+            agent.get_output(packet)
+            stats.add(tick, agent.index, perf_counter() - start, describe(agent))
+
+        if pace:
+            deadline += BUDGET
+            sleep(max(deadline - perf_counter(), 0))
+
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m offline.driver", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("bot", choices=BOTS)
+    parser.add_argument("--replay", help="recorded packets (offline.recorder) instead of a synthetic scenario")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="kickoff")
+    parser.add_argument("--team-size", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=FPS * 60, help="synthetic packets to generate")
+    parser.add_argument("--indices", type=int, nargs="+", default=[0], help="cars driven by the bot")
+    parser.add_argument("--pace", action="store_true", help="feed packets at 120 Hz instead of as fast as possible")
+    parser.add_argument("--spans", action="store_true", help="time the hot path spans too (see util.spans)")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        replay = Replay(args.replay)
+        field_info, packets, first = replay.field_info, iter(replay), replay.packet(0)
+    else:
+        generator = PacketGenerator(scenario(args.scenario, args.team_size, args.seed))
+        field_info, packets, first = generator.field_info(), generator.packets(args.ticks), generator.packet
+
+    agent_class, describe, ready = load_bot(args.bot)
+    matchcomms = LocalMatchcomms()
+    if issubclass(agent_class, PythonHivemind):
+        agents = [HiveAgent(agent_class, first, args.indices, field_info)]
+        root = (agent_class, "get_outputs")
+    else:
+        agents = [make_agent(agent_class, first, index, field_info, matchcomms) for index in sorted(args.indices)]
+        root = (agent_class, "get_output")
+    if ready is not None:
+        for agent in agents:
+            ready(agent)
+    if args.spans:
+        if hasattr(agent_class, "render"):
+            spans.register(agent_class, "render", "render")
+        spans.enable(root=root)
+
+    start = perf_counter()
+    stats = drive(agents, packets, describe, args.pace)
+    print(f"Drove {args.bot} {sorted(args.indices)} for {len(stats.latencies) // len(agents)} ticks "
+          f"in {perf_counter() - start:.2f} s")
+    print(stats.report())
+    if args.spans:
+        print(spans.report())
+
+    # Bots with a non-blocking comms pump (util.comms) report their message latency and queue depth, and with a
+    # shared world (util.shared_world) how often the marujos used the captain's predictions
+    for agent in agents:
+        if hasattr(agent, "comms"):
+            print(f"Index {agent.index}: {agent.comms.report()}")
+        if getattr(agent, "world", None) is not None:
+            print(f"Index {agent.index}: {agent.world.report()}, predictions {agent.info.prediction_stats()}")
+
+    # Bots that degrade under budget pressure (util.deadline) report how often they did
+    deadline = sys.modules.get("util.deadline")
+    if deadline is not None and deadline.ticks:
+        print(deadline.report())
+
+    # Like RLBot does when the match ends, so the bots close what they hold (e.g. the shared world segment)
+    for agent in agents:
+        agent.retire()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Synthetic GameTickPacket / FieldInfoPacket for driving the bots without Rocket League running,
+e.g. to profile the read_packet -> policy -> play pipeline in a tight loop on a headless box.
+
+    generator = PacketGenerator(scenario("kickoff", team_size=3))
+    field_info = generator.field_info()
+    for packet in generator.packets(1200):
+        controls = agent.get_output(packet)
+
+Scenarios only set up the initial state, the generator then moves the ball and cars ballistically
+(gravity, floor and wall bounces, boost pads respawning) so consecutive packets stay plausible.
+"""
+import math
+
+import numpy as np
+from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket, MAX_PLAYERS
+
+from util.arena import BOOST_PADS, FIELD_LENGTH, FIELD_WIDTH, GOAL_Y
+
+FPS = 120
+GRAVITY = -650.0
+BALL_RADIUS = 92.75
+CAR_HEIGHT = 17.01
+CEILING = 2044.0
+GOAL_WIDTH = 1786.0
+GOAL_HEIGHT = 643.0
+OCTANE_HITBOX = (118.01, 84.2, 36.16)
+OCTANE_HITBOX_OFFSET = (13.88, 0.0, 20.75)
+FULL_BOOST_RESPAWN = 10.0
+SMALL_BOOST_RESPAWN = 4.0
+
+# Kickoff spawns of the blue team (x, y, yaw), the orange ones are mirrored
+KICKOFF_SPAWNS = [
+    (-2048.0, -2560.0, math.pi / 4),
+    (2048.0, -2560.0, 3 * math.pi / 4),
+    (-256.0, -3840.0, math.pi / 2),
+    (256.0, -3840.0, math.pi / 2),
+    (0.0, -4608.0, math.pi / 2),
+]
+
+
+class CarSetup:
+    def __init__(self, team, location, yaw=0.0, velocity=(0.0, 0.0, 0.0), boost=33, on_ground=True, pitch=0.0):
+        self.team = team
+        self.location = np.array(location, dtype=float)
+        self.velocity = np.array(velocity, dtype=float)
+        self.yaw = yaw
+        self.pitch = pitch
+        self.boost = boost
+        self.on_ground = on_ground
+
+
+class Scenario:
+    def __init__(self, name, cars, ball_location, ball_velocity=(0.0, 0.0, 0.0), is_kickoff_pause=False):
+        self.name = name
+        self.cars = cars
+        self.ball_location = np.array(ball_location, dtype=float)
+        self.ball_velocity = np.array(ball_velocity, dtype=float)
+        self.is_kickoff_pause = is_kickoff_pause
+
+
+def _mirror(x, y, yaw):
+    return -x, -y, yaw + math.pi
+
+
+def _random_car(team, rng, boost=None):
+    # Somewhere on our half of the field, facing roughly towards the ball, i.e. the middle
+    sign = 1 if team else -1
+    x = rng.uniform(-FIELD_WIDTH / 2 + 500, FIELD_WIDTH / 2 - 500)
+    y = sign * rng.uniform(500, FIELD_LENGTH / 2 - 800)
+    yaw = math.atan2(-y, -x) + rng.uniform(-0.5, 0.5)
+    speed = rng.uniform(0, 1400)
+    velocity = (speed * math.cos(yaw), speed * math.sin(yaw), 0.0)
+    return CarSetup(team, (x, y, CAR_HEIGHT), yaw, velocity, int(rng.integers(0, 101)) if boost is None else boost)
+
+
+def kickoff(team_size, rng):
+    spawns = [KICKOFF_SPAWNS[i] for i in rng.permutation(len(KICKOFF_SPAWNS))[:team_size]]
+    cars = [CarSetup(0, (x, y, CAR_HEIGHT), yaw) for x, y, yaw in spawns]
+    cars += [CarSetup(1, (x, y, CAR_HEIGHT), yaw) for x, y, yaw in (_mirror(*spawn) for spawn in spawns)]
+    return Scenario("kickoff", cars, (0.0, 0.0, BALL_RADIUS), is_kickoff_pause=True)
+
+
+def ball_in_corner(team_size, rng):
+    # Ball rolling along the back wall near the orange corner, blue attacking
+    cars = [_random_car(team, rng) for team in (0, 1) for _ in range(team_size)]
+    ball = (rng.uniform(2800, 3800), rng.uniform(4300, 4900), BALL_RADIUS)
+    return Scenario("ball_in_corner", cars, ball, ball_velocity=(-rng.uniform(200, 800), 0.0, 0.0))
+
+
+def aerial(team_size, rng):
+    # High ball dropping near midfield, the first blue car already in the air going for it
+    cars = [_random_car(team, rng) for team in (0, 1) for _ in range(team_size)]
+    cars[0] = CarSetup(0, (0.0, -1500.0, 600.0), math.pi / 2, (0.0, 1200.0, 400.0), boost=80, on_ground=False,
+                       pitch=0.6)
+    ball = (rng.uniform(-500, 500), rng.uniform(-300, 300), rng.uniform(1200, 1600))
+    return Scenario("aerial", cars, ball, ball_velocity=(rng.uniform(-300, 300), rng.uniform(-300, 300), 200.0))
+
+
+def open_play(team_size, rng):
+    cars = [_random_car(team, rng) for team in (0, 1) for _ in range(team_size)]
+    ball = (rng.uniform(-3000, 3000), rng.uniform(-4000, 4000), rng.uniform(BALL_RADIUS, 800))
+    return Scenario("open_play", cars, ball, ball_velocity=tuple(rng.uniform(-1000, 1000, 3)))
+
+
+SCENARIOS = {
+    "kickoff": kickoff,
+    "ball_in_corner": ball_in_corner,
+    "aerial": aerial,
+    "open_play": open_play,
+}
+
+
+def scenario(name, team_size=1, seed=0) -> Scenario:
+    """Scenario name (see SCENARIOS) with team_size cars per team (1v1, 2v2, 3v3...)"""
+    if name not in SCENARIOS:
+        raise ValueError(f"Unknown scenario {name!r}, expected one of {', '.join(SCENARIOS)}")
+    if not 1 <= 2 * team_size <= MAX_PLAYERS:
+        raise ValueError(f"team_size must be between 1 and {MAX_PLAYERS // 2}")
+    return SCENARIOS[name](team_size, np.random.default_rng(seed))
+
+
+def _set(vector, values):
+    vector.x, vector.y, vector.z = values
+
+
+class PacketGenerator:
+    """
+    Builds the packets of a scenario and advances them by dt every tick.
+    The same GameTickPacket object is updated in place and returned every time, like a live match would hand us.
+    """
+
+    def __init__(self, scenario: Scenario, dt=1 / FPS):
+        self.scenario = scenario
+        self.dt = dt
+        self.packet = GameTickPacket()
+        self._field_info = None
+
+        self.ball_location = scenario.ball_location.copy()
+        self.ball_velocity = scenario.ball_velocity.copy()
+        self.car_locations = np.array([car.location for car in scenario.cars])
+        self.car_velocities = np.array([car.velocity for car in scenario.cars])
+        self.pad_timers = np.zeros(len(BOOST_PADS))
+        self.pad_locations = np.array([pad[:3] for pad in BOOST_PADS])
+        self.pad_respawn = np.array([FULL_BOOST_RESPAWN if pad[3] else SMALL_BOOST_RESPAWN for pad in BOOST_PADS])
+        self._fill()
+
+    def field_info(self) -> FieldInfoPacket:
+        if self._field_info is None:
+            self._field_info = field_info()
+        return self._field_info
+
+    def _fill(self):
+        packet, scenario = self.packet, self.scenario
+
+        packet.num_cars = len(scenario.cars)
+        team_indices = [0, 0]
+        for i, setup in enumerate(scenario.cars):
+            car = packet.game_cars[i]
+            car.name = f"{'Blue' if setup.team == 0 else 'Orange'} {team_indices[setup.team]}"
+            team_indices[setup.team] += 1
+            car.team = setup.team
+            car.boost = setup.boost
+            car.is_bot = True
+            car.has_wheel_contact = setup.on_ground
+            car.jumped = not setup.on_ground
+            car.spawn_id = i + 1
+            car.physics.rotation.pitch, car.physics.rotation.yaw, car.physics.rotation.roll = setup.pitch, setup.yaw, 0
+            _set(car.hitbox, OCTANE_HITBOX)
+            _set(car.hitbox_offset, OCTANE_HITBOX_OFFSET)
+
+        packet.num_boost = len(BOOST_PADS)
+        for i in range(packet.num_boost):
+            packet.game_boosts[i].is_active = True
+        self._written_timers = np.zeros(len(BOOST_PADS))
+        packet.game_ball.collision_shape.type = 1 # sphere
+        packet.game_ball.collision_shape.sphere.diameter = 2 * BALL_RADIUS
+        packet.game_ball.latest_touch.player_index = -1
+
+        info = packet.game_info
+        info.is_round_active = True
+        info.is_kickoff_pause = scenario.is_kickoff_pause
+        info.world_gravity_z = GRAVITY
+        info.game_speed = 1.0
+        info.game_time_remaining = 300.0
+
+        packet.num_teams = 2
+        for team in range(2):
+            packet.teams[team].team_index = team
+
+        self._write_state()
+
+    def _write_state(self):
+        packet = self.packet
+        _set(packet.game_ball.physics.location, self.ball_location)
+        _set(packet.game_ball.physics.velocity, self.ball_velocity)
+
+        for i in range(packet.num_cars):
+            physics = packet.game_cars[i].physics
+            _set(physics.location, self.car_locations[i])
+            _set(physics.velocity, self.car_velocities[i])
+            packet.game_cars[i].is_super_sonic = bool(np.dot(self.car_velocities[i], self.car_velocities[i]) > 2200 ** 2)
+
+        # Only the pads whose timer changed, ctypes writes are what this spends its time on
+        for i in np.flatnonzero(self.pad_timers != self._written_timers):
+            packet.game_boosts[i].timer = self.pad_timers[i]
+            packet.game_boosts[i].is_active = bool(self.pad_timers[i] <= 0)
+        self._written_timers = self.pad_timers.copy()
+
+    def step(self) -> GameTickPacket:
+        """Advance the state by dt and return the updated packet"""
+        dt, info = self.dt, self.packet.game_info
+
+        info.seconds_elapsed += dt
+        info.frame_num += 1
+        info.game_time_remaining = max(info.game_time_remaining - dt, 0)
+        if info.is_kickoff_pause and info.seconds_elapsed > 3.0:
+            info.is_kickoff_pause = False # countdown over, everything can move
+
+        if not info.is_kickoff_pause:
+            self._step_ball(dt)
+            self._step_cars(dt)
+        self._write_state()
+        return self.packet
+
+    def _step_ball(self, dt):
+        location, velocity = self.ball_location, self.ball_velocity
+        velocity[2] += GRAVITY * dt
+        location += velocity * dt
+
+        # Bounce off the floor, ceiling and side / back walls (goals included, there's no scoring)
+        limits = (FIELD_WIDTH / 2 - BALL_RADIUS, GOAL_Y - BALL_RADIUS, CEILING - BALL_RADIUS)
+        for axis, limit in enumerate(limits):
+            if location[axis] > limit:
+                location[axis], velocity[axis] = limit, -0.6 * velocity[axis]
+        for axis, limit in enumerate((-limits[0], -limits[1], BALL_RADIUS)):
+            if location[axis] < limit:
+                location[axis], velocity[axis] = limit, -0.6 * velocity[axis]
+
+    def _step_cars(self, dt):
+        packet, locations, velocities = self.packet, self.car_locations, self.car_velocities
+        airborne = locations[:, 2] > CAR_HEIGHT
+        velocities[airborne, 2] += GRAVITY * dt
+        locations += velocities * dt
+
+        landed = locations[:, 2] <= CAR_HEIGHT
+        locations[landed, 2] = CAR_HEIGHT
+        velocities[landed, 2] = 0
+        np.clip(locations[:, 0], -FIELD_WIDTH / 2, FIELD_WIDTH / 2, out=locations[:, 0])
+        np.clip(locations[:, 1], -GOAL_Y, GOAL_Y, out=locations[:, 1])
+
+        # Boost pads picked up by any car respawn after their timer runs out
+        self.pad_timers = np.maximum(self.pad_timers - dt, 0)
+        offsets = self.pad_locations[None, :, :2] - locations[:, None, :2]
+        touching = np.einsum("cpi,cpi->cp", offsets, offsets) < 160 ** 2
+        for i in range(packet.num_cars):
+            car = packet.game_cars[i]
+            car.has_wheel_contact = bool(landed[i])
+            for pad in np.flatnonzero(touching[i] & (self.pad_timers <= 0)):
+                self.pad_timers[pad] = self.pad_respawn[pad]
+                car.boost = min(car.boost + (100 if BOOST_PADS[pad][3] else 12), 100)
+
+    def packets(self, count):
+        """Yield the current packet followed by count - 1 steps"""
+        yield self.packet
+        for _ in range(count - 1):
+            yield self.step()
+
+
+def field_info() -> FieldInfoPacket:
+    """FieldInfoPacket of the standard soccar arena"""
+    info = FieldInfoPacket()
+
+    info.num_boosts = len(BOOST_PADS)
+    for i, (x, y, z, is_full_boost) in enumerate(BOOST_PADS):
+        _set(info.boost_pads[i].location, (x, y, z))
+        info.boost_pads[i].is_full_boost = is_full_boost
+
+    info.num_goals = 2
+    for team, sign in ((0, -1), (1, 1)):
+        goal = info.goals[team]
+        goal.team_num = team
+        _set(goal.location, (0.0, sign * GOAL_Y, GOAL_HEIGHT))
+        _set(goal.direction, (0.0, -sign, 0.0))
+        goal.width = GOAL_WIDTH
+        goal.height = GOAL_HEIGHT
+
+    return info
+
+
+class StubRenderer:
+    """Stands in for the RLBot renderer: every draw call is a no-op"""
+
+    def is_rendering(self):
+        return False
+
+    def __getattr__(self, name):
+        return _no_op
+
+
+def _no_op(*args, **kwargs):
+    return None
+
+
+def main():
+    """Time packet generation for every scenario and team size"""
+    from timeit import timeit
+
+    fps = 120
+    n_times = 1200
+    for name in SCENARIOS:
+        for team_size in (1, 2, 3):
+            generator = PacketGenerator(scenario(name, team_size))
+            time_taken = timeit(generator.step, number=n_times)
+            ball = generator.packet.game_ball.physics.location
+            print(f"{name} {team_size}v{team_size}: ball at ({ball.x:.0f}, {ball.y:.0f}, {ball.z:.0f}) after "
+                  f"{n_times / fps:.0f} s, {time_taken * fps / n_times * 100:.3f} % of our time budget per packet")
+
+
+if __name__ == "__main__":
+    main()
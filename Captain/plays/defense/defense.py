@@ -1,6 +1,8 @@
 from plays.actions.drive import Drive, Stop, AdvancedDrive
 from plays.play import Play
 
+import numpy as np
+
 from rlutilities.linear_algebra import vec3, dot
 from rlutilities.simulation import Car
 
@@ -86,13 +88,19 @@ class Defense(Play):
             if self.car.boost < 90 and self.travel.interruptible():
                 to_target = ground_direction(self.car, self.travel.target)
 
-                for pad in self.state.large_boost_pads + self.state.small_boost_pads:
+                # Only the active pads in range (large ones first), straight from the boost pad array
+                pads = self.state.boost_pads
+                position = self.car.position
+                near = (
+                    pads["is_active"]
+                    & (np.linalg.norm(pads["location"] - (position[0], position[1], position[2]), axis=1) < self.BOOST_LOOK_RADIUS)
+                )
+                order = self.state.pad_order
+                for index in order[near[order]]:
+                    pad = self.state.boost_pad_views[index]
                     to_pad = ground_direction(self.car, pad)
 
-                    if(
-                        pad.is_active and distance(self.car, pad) < self.BOOST_LOOK_RADIUS
-                        and angle_between(to_target, to_pad) < self.BOOST_LOOK_ANGLE
-                    ):
+                    if angle_between(to_target, to_pad) < self.BOOST_LOOK_ANGLE:
                         self.boost_pad = pad
                         self.drive.target_pos = pad.position
                         self.drive.target_speed = 2200
@@ -101,12 +101,13 @@ def choose_play(state, agent):
     # Update ball predictions
     state.predict_ball()
 
-    # Compute all possible intercepts
+    # Compute all possible intercepts (arrival times for the whole team come from a single reachability computation)
+    reachability = state.get_reachability()
 
     team_intercepts = []
     agent_intercept = None
     for car in team:
-        intercept = Intercept(car, state.ball_predictions)
+        intercept = reachability.intercept(car)
         team_intercepts.append(intercept)
 
         if(car is agent):
@@ -6,6 +6,7 @@ from rlutilities.mechanics import Aerial
 from rlutilities.simulation import Car, Ball
 
 from util.game_info import GameInfo
+from util import deadline
 from util.intercept import Intercept
 from util.math import angle_to, distance, ground_distance, clamp, ground_direction, abs_clamp, range_map, direction
 
@@ -33,6 +34,7 @@ class AerialStrike(Strike):
 
         self.flying = False
         self.flight_path = []
+        self.simulated_car = None
 
         self.name = "AerialStrike"
 
@@ -96,8 +98,10 @@ class AerialStrike(Strike):
         else:
             super().step(dt)
 
-            # Simulate what the aerial will look like
-            simulated_car = self.simulate_flight(self.car, self.aerial, self.flight_path)
+            # Simulate what the aerial will look like (keep last tick's simulation if we're short on time)
+            if self.simulated_car is None or not deadline.degraded(deadline.SKIP_FLIGHT_SIMULATION):
+                self.simulated_car = self.simulate_flight(self.car, self.aerial, self.flight_path)
+            simulated_car = self.simulated_car
 
             speed_towards_target = dot(self.car.velocity, ground_direction(self.car, self.aerial.target))
             speed_needed = ground_distance(self.car, self.aerial.target) / time_left
@@ -4,11 +4,13 @@ from rlutilities.mechanics import AerialTurn
 from rlutilities.simulation import Car, Pad
 from util.math import distance
 from util.game_info import GameInfo
-from util.intercept import estimate_time
+from util.intercept import estimate_time, estimate_times
 from plays.actions.drive import AdvancedDrive, Arrive
 
 import math
 
+import numpy as np
+
 class Refuel(Play):
     """
     Choose a large boost pad and go pick it up.
@@ -19,15 +21,20 @@ class Refuel(Play):
         self.state = state
         self.small = small_refuel
 
-        if not small_refuel:
-            pads = set(state.large_boost_pads) - forbidden_pads
-        else:
-            pads = set(state.small_boost_pads) - forbidden_pads
+        # Candidate pads straight from the GameInfo.boost_pads array, arrival times estimated all at once
+        indices = state.small_pad_indices if small_refuel else state.large_pad_indices
+        if forbidden_pads:
+            indices = indices[~np.isin(indices, [pad.index for pad in forbidden_pads])]
+        pads = state.boost_pads[indices]
 
-        available_pads = {pad for pad in pads if pad.is_active or estimate_time(agent, pad.position) * 0.8 > pad.timer}
+        time_left = state.pad_recharge_times[indices] - pads["timer"]
+        available = pads["is_active"] | (estimate_times(agent, pads["location"]) * 0.8 > time_left)
         pos = (state.ball.position + agent.position * 2 + state.net.center) / 4
 
-        self.pad = min(available_pads, key=lambda pad: distance(pad.position, pos)) if available_pads else None
+        self.pad = None
+        if available.any():
+            distances = np.linalg.norm(pads["location"][available] - (pos[0], pos[1], pos[2]), axis=1)
+            self.pad = state.boost_pad_views[indices[available][np.argmin(distances)]]
 
         self.pad_was_active = self.pad and self.pad.is_active # Used cus we might start by going to a pad that's not available but about to spawn
 
@@ -36,13 +36,13 @@ def choose_stance(info: GameInfo, my_car: Car, team, last_sent):
 
         return assigned_actions
 
-    # Interceptions
-    my_intercept = Intercept(my_car, info.ball_predictions)
-    our_intercepts = {index: Intercept(info.cars[index], info.ball_predictions) for index in team}
+    # Interceptions - every car's arrival times are computed at once by the reachability matrix
+    reachability = info.get_reachability()
+    my_intercept = reachability.intercept(my_car)
+    our_intercepts = {index: reachability.intercept(info.cars[index]) for index in team}
 
-    their_intercepts = [Intercept(opponent, info.ball_predictions) for opponent in opponents]
-    their_intercept = min(their_intercepts, key=lambda i: i.time)
-    opponent = their_intercept.car
+    opponent = reachability.first_to_ball(opponents)
+    their_intercept = reachability.intercept(opponent)
 
     good_intercepts = [our_intercepts[i] for i in our_intercepts if align(our_intercepts[i].car.position, our_intercepts[i].ball, their_goal) > 0.0]
     if good_intercepts:
@@ -97,7 +97,7 @@ def general_defense(info, my_car, clutch=False):
 
     info.predict_ball()
 
-    my_intercept = Intercept(my_car, info.ball_predictions)
+    my_intercept = info.get_reachability().intercept(my_car)
 
     ball_in_their_half = abs(my_intercept.position[1] - their_goal[1]) < 3000
     shadow_distance = 4000 if ball_in_their_half else 6000
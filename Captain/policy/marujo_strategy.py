@@ -28,7 +28,7 @@ def choose_action(info: GameInfo, my_car: Car, stance):
 
     info.predict_ball()
 
-    my_intercept = Intercept(my_car, info.ball_predictions)
+    my_intercept = info.get_reachability().intercept(my_car)
 
     banned_boostpads = {pad for pad in info.large_boost_pads if
                         abs(pad.position[1] - their_goal[1]) < abs(my_intercept.position[1] - their_goal[1])
@@ -61,7 +61,13 @@ def choose_action(info: GameInfo, my_car: Car, stance):
 def danger(info, my_car):
 
     info.predict_ball()
-    my_intercept = Intercept(my_car, info.ball_predictions)
+
+    # Runs every tick: only a single car scan unless the whole team's matrix is already there
+    reachability = info.cached_reachability()
+    if reachability is not None:
+        my_intercept = reachability.intercept(my_car)
+    else:
+        my_intercept = Intercept(my_car, info.ball_predictions)
     their_goal = ground(info.enemy_net.center)
     my_goal = ground(info.net.center)
 
@@ -0,0 +1,138 @@
+"""
+Pipelined planning: the next decision (choose_stance for captains, then choose_action) is worked out on a background
+thread against a copy of the game state, while the agent keeps stepping its current play on the main thread.
+When the current play finishes, the agent takes the latest finished plan instead of planning inside get_output.
+
+Plays keep references to the GameInfo (and its cars) they were planned with, so every plan gets a GameInfo of its
+own out of a pool of three (live, last finished plan, plan in progress). Taking a plan makes its GameInfo the live
+one and hands the old live one back to the pool.
+
+This is not a speedup: the planner thread holds the GIL while get_output waits for it, so the agent's own ticks get
+slower. In a 3v3 offline run (offline.driver, 2400 ticks), p99 of get_output went from 5.0 to 8.4 ms and ticks over
+budget from 0.05 % to 1.1 %, which is why settings.PIPELINED_PLANNING is off.
+"""
+import threading
+from time import perf_counter
+
+from policy import base_policy, marujo_strategy
+
+
+class Plan:
+    def __init__(self, info, team_actions, stance, action, seconds):
+        self.info = info # GameInfo the plan was made with, becomes the agent's when taken
+        self.team_actions = team_actions # {index: stance} for captains, None otherwise
+        self.stance = stance
+        self.action = action
+        self.seconds = seconds # how long planning took
+
+
+class Planner:
+    MAX_AGE = 0.1 # game seconds, older plans are thrown away
+    INTERVAL = 1 / 30 # game seconds between the start of two plans
+
+    def __init__(self, index, make_info, log=None):
+        """make_info() returns a new GameInfo set up like the agent's, log(message) gets planning errors"""
+        self.index = index
+        self.log = log
+        self._free = [make_info(), make_info()]
+        self._ready = None
+        self._request = None
+        self._busy = False
+        self._last_request_time = -1
+        self._condition = threading.Condition()
+
+        self.planned = 0
+        self.taken = 0
+        self.discarded = 0
+        self.planning_time = 0.0
+
+        self._thread = threading.Thread(target=self._run, name=f"planner {index}", daemon=True)
+        self._thread.start()
+
+    def request(self, packet, field_info, stance, captain, team, last_sent):
+        """Start planning from this packet, unless a plan is already in progress or the last one started recently"""
+        time = packet.game_info.seconds_elapsed
+        with self._condition:
+            if self._busy or 0 <= time - self._last_request_time < self.INTERVAL:
+                return
+            # RLBot reuses the packet struct, the worker gets a copy
+            self._request = (type(packet).from_buffer_copy(packet), field_info, stance, captain, list(team),
+                             dict(last_sent))
+            self._busy = True
+            self._last_request_time = time
+            self._condition.notify()
+
+    def take(self, live_info, stance, captain):
+        """
+        The latest finished plan if it still applies (recent, nobody touched the ball since and, for marujos, made
+        for the stance we're in), None otherwise. live_info goes back to the pool when a plan is returned.
+        """
+        with self._condition:
+            plan, self._ready = self._ready, None
+            if plan is None:
+                return None
+
+            if (
+                live_info.time - plan.info.time > self.MAX_AGE
+                or live_info.latest_touch_time != plan.info.latest_touch_time
+                or not captain and plan.stance != stance
+            ):
+                self._free.append(plan.info)
+                self.discarded += 1
+                return None
+
+            self._free.append(live_info)
+            self.taken += 1
+            return plan
+
+    def stop(self):
+        with self._condition:
+            self._request = False
+            self._condition.notify()
+
+    def report(self) -> str:
+        mean = self.planning_time / self.planned * 1000 if self.planned else 0.0
+        return (f"Planned {self.planned} times ({mean:.2f} ms on average), "
+                f"{self.taken} plans taken, {self.discarded} discarded")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._request is None:
+                    self._condition.wait()
+                if self._request is False:
+                    return
+                request, self._request = self._request, None
+                info = self._free.pop()
+
+            try:
+                plan = self._plan(info, *request)
+            except Exception as e:
+                plan = None
+                if self.log is not None:
+                    self.log(f"Planning failed: {e!r}")
+
+            with self._condition:
+                if plan is None:
+                    self._free.append(info)
+                else:
+                    if self._ready is not None:
+                        self._free.append(self._ready.info)
+                    self._ready = plan
+                    self.planned += 1
+                    self.planning_time += plan.seconds
+                self._busy = False
+
+    def _plan(self, info, packet, field_info, stance, captain, team, last_sent):
+        # Same decision as Captain.get_output makes when its action is finished
+        start = perf_counter()
+        info.read_packet(packet, field_info)
+        my_car = info.cars[self.index]
+
+        team_actions = None
+        if captain:
+            team_actions = base_policy.choose_stance(info, my_car, team, last_sent)
+            stance = team_actions[self.index]
+
+        action = marujo_strategy.choose_action(info, my_car, stance)
+        return Plan(info, team_actions, stance, action, perf_counter() - start)
@@ -5,8 +5,7 @@ from action.strikes.strike import Strike
 from rlutilities.linear_algebra import dot
 from rlutilities.simulation import Car
 from policy import offense, defense, kickoffs
-from tools.game_info import GameInfo
-from tools.intercept import Intercept
+from util.game_info import GameInfo
 from tools.math import sign
 from tools.vector_math import align, ground, ground_distance, ground_direction
 
@@ -27,10 +26,11 @@ def choose_action(info: GameInfo, my_car: Car):
 
     info.predict_ball()
 
-    my_intercept = Intercept(my_car, info.ball_predictions)
-    their_intercepts = [Intercept(opponent, info.ball_predictions) for opponent in opponents]
-    their_intercept = min(their_intercepts, key=lambda i: i.time)
-    opponent = their_intercept.car
+    # Every car's arrival times come from a single reachability computation
+    reachability = info.get_reachability()
+    my_intercept = reachability.intercept(my_car)
+    opponent = reachability.first_to_ball(opponents)
+    their_intercept = reachability.intercept(opponent)
 
     banned_boostpads = {pad for pad in info.large_boost_pads if
                         abs(pad.position[1] - their_goal[1]) < abs(my_intercept.position[1] - their_goal[1])
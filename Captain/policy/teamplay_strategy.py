@@ -3,8 +3,7 @@ from action.recovery import Recovery
 from action.refuel import Refuel
 from rlutilities.simulation import Car
 from policy import offense, kickoffs, defense
-from tools.game_info import GameInfo
-from tools.intercept import Intercept
+from util.game_info import GameInfo
 from tools.vector_math import align, ground, distance, ground_distance
 
 
@@ -31,8 +30,10 @@ def choose_action(info: GameInfo, my_car: Car):
 
     info.predict_ball()
 
-    my_intercept = Intercept(my_car, info.ball_predictions)
-    teammates_intercepts = [Intercept(mate, info.ball_predictions) for mate in teammates]
+    # Every car's arrival times come from a single reachability computation
+    reachability = info.get_reachability()
+    my_intercept = reachability.intercept(my_car)
+    teammates_intercepts = [reachability.intercept(mate) for mate in teammates]
     our_intercepts = teammates_intercepts + [my_intercept]
 
     good_intercepts = [i for i in our_intercepts if align(i.car.position, i.ball, their_goal) > 0.0]
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The bot's modules import each other from the Captain folder (util..., offline...), like RLBot runs them
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from util.lookup_data import arrival_time_table
+from util.lookup_data.arrival_time_table import ArrivalTimeTable, arrival_times
+from util.physics.drive_1d_distance import state_at_distance_vectorized
+
+
+@pytest.fixture(scope="module")
+def queries():
+    rng = np.random.default_rng(0)
+    n = 5000
+    distance = rng.uniform(0, 14000, n)
+    speed = rng.uniform(-2300, 2300, n)
+    boost = rng.integers(0, 101, n).astype(np.float64)
+    return distance, speed, boost
+
+
+def test_loaded_on_first_use(monkeypatch):
+    monkeypatch.setattr(arrival_time_table, "_arrival_times", None)
+    table = arrival_times()
+    assert isinstance(table, ArrivalTimeTable)
+    assert arrival_times() is table
+
+
+def test_table_matches_the_solver(queries):
+    distance, speed, boost = queries
+    truth = state_at_distance_vectorized(distance, speed, boost)[0]
+    errors = np.abs(arrival_times().time_vectorized(distance, speed, boost) - truth)
+    assert errors.mean() < 1e-3
+    assert np.percentile(errors, 99) < 2e-3
+
+
+def test_scalar_matches_vectorized(queries):
+    table = arrival_times()
+    distance, speed, boost = (x[:500] for x in queries)
+    scalar = [table.time(d, v, b) for d, v, b in zip(distance, speed, boost)]
+    assert np.allclose(scalar, table.time_vectorized(distance, speed, boost), atol=1e-5)
+
+
+def test_edges():
+    table = arrival_times()
+    # Already there, even when driving backwards
+    assert table.time(0.0, -1000.0, 0.0) == 0.0
+    assert table.time(-10.0, 500.0, 50.0) == 0.0
+    assert list(table.time_vectorized([0.0, -5.0], 500.0, 50.0)) == [0.0, 0.0]
+
+    # Past the last row, at the speed reached
+    near, far = table.time(table.max_distance, 0.0, 100.0), table.time(table.max_distance + 2300.0, 0.0, 100.0)
+    assert 0.9 < far - near < 1.5
+    # Out of range speeds and boosts are clamped
+    assert table.time(1000.0, 5000.0, 500.0) == pytest.approx(table.time(1000.0, 2300.0, 100.0))
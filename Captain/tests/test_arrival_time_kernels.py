@@ -0,0 +1,59 @@
+from math import acos, sqrt
+
+import numpy as np
+import pytest
+
+from util.physics.arrival_time import estimate_time, estimate_times_vectorized, CAR_ROW_SIZE
+from util.physics.drive_1d_distance import state_at_distance
+
+
+def reference(car, target):
+    # The steps of util.intercept.estimate_time, on a car row
+    position, forward, speed, boost, turning_radius = car[0:3], car[3:6], car[6], car[7], car[8]
+    offset = target - position
+    cos_angle = np.dot(offset, forward) / (np.linalg.norm(offset) * np.linalg.norm(forward))
+    turning = acos(min(max(cos_angle, -1.0), 1.0)) * turning_radius / 1800
+    if turning < 0.5:
+        turning = 0.0
+    dist = sqrt(offset[0] ** 2 + offset[1] ** 2) - 200
+    if dist < 0:
+        return turning
+    return state_at_distance(dist, speed, boost)[0] * 1.05 + turning
+
+
+@pytest.fixture(scope="module")
+def cars():
+    rng = np.random.default_rng(0)
+    yaw = rng.uniform(-np.pi, np.pi, 6)
+    return np.column_stack([
+        rng.uniform(-4000, 4000, 6), rng.uniform(-5000, 5000, 6), np.full(6, 17.0),
+        np.cos(yaw), np.sin(yaw), np.zeros(6),
+        rng.uniform(-1000, 2300, 6), rng.uniform(0, 100, 6), rng.uniform(400, 1200, 6),
+    ])
+
+
+@pytest.fixture(scope="module")
+def targets():
+    rng = np.random.default_rng(1)
+    return np.column_stack([rng.uniform(-4000, 4000, 50), rng.uniform(-5000, 5000, 50), rng.uniform(93, 600, 50)])
+
+
+def test_scalar_kernel_matches_reference(cars, targets):
+    for car in cars:
+        for target in targets:
+            assert estimate_time(*car, *target) == pytest.approx(reference(car, target), rel=1e-6, abs=1e-9)
+
+
+def test_close_targets_only_cost_turning():
+    car = np.array([0, 0, 17, 1, 0, 0, 500, 50, 1000], dtype=np.float64)
+    assert estimate_time(*car, 100.0, 0.0, 17.0) == 0.0 # ahead
+    assert estimate_time(*car, -150.0, 0.0, 17.0) == pytest.approx(np.pi * 1000 / 1800) # behind
+
+
+def test_vectorized_broadcasts_over_cars(cars, targets):
+    assert cars.shape[1] == CAR_ROW_SIZE
+    times = estimate_times_vectorized(cars, targets)
+    assert times.shape == (len(cars), len(targets))
+    for i, car in enumerate(cars):
+        assert np.allclose(times[i], estimate_times_vectorized(car, targets))
+        assert np.allclose(times[i], [estimate_time(*car, *target) for target in targets])
@@ -0,0 +1,65 @@
+import numpy as np
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.car_table import CarTable
+
+
+def make_packet(teams):
+    packet = GameTickPacket()
+    packet.num_cars = len(teams)
+    for i, team in enumerate(teams):
+        car = packet.game_cars[i]
+        car.team = team
+        car.physics.location.x, car.physics.location.y, car.physics.location.z = i, 10 * i, 17
+        car.physics.velocity.x = 100 * i
+        car.physics.rotation.yaw = 0.5 * i
+        car.physics.angular_velocity.z = -i
+        car.boost = 10 * i
+        car.is_demolished = i == 2
+    return packet
+
+
+def test_update_copies_the_packet():
+    packet = make_packet([0, 0, 1, 1])
+    cars = CarTable(team=0, index=1)
+    cars.update(packet)
+
+    assert cars.count == 4
+    assert list(cars.teams[:4]) == [0, 0, 1, 1]
+    assert np.allclose(cars.location[:4], [[i, 10 * i, 17] for i in range(4)])
+    assert np.allclose(cars.velocity[:4, 0], [0, 100, 200, 300])
+    assert np.allclose(cars.rotation[:4, 1], [0, 0.5, 1, 1.5])
+    assert np.allclose(cars.angular_velocity[:4, 2], [0, -1, -2, -3])
+    assert list(cars.boost[:4]) == [0, 10, 20, 30]
+    assert list(cars.is_demolished[:4]) == [False, False, True, False]
+    assert cars.me["boost"] == 10
+
+
+def test_update_follows_the_reused_packet():
+    packet = make_packet([0, 1])
+    cars = CarTable(team=0, index=0)
+    cars.update(packet)
+
+    # RLBot refills the same packet every tick
+    packet.game_cars[1].physics.location.x = 1234
+    packet.game_cars[1].boost = 99
+    cars.update(packet)
+    assert cars.location[1, 0] == 1234
+    assert cars.boost[1] == 99
+
+    # and the car count can change, e.g. a bot joining
+    packet.num_cars = 3
+    packet.game_cars[2].team = 0
+    cars.update(packet)
+    assert cars.count == 3
+    assert list(cars.allies()) == [2]
+
+
+def test_team_queries():
+    cars = CarTable(team=1, index=3)
+    cars.update(make_packet([0, 1, 0, 1, 1]))
+
+    assert list(cars.allies()) == [1, 4]
+    assert list(cars.enemies()) == [0, 2]
+    assert cars.first_teammate_before(3) == 1
+    assert cars.first_teammate_before(1) is None
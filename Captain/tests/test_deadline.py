@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from util import deadline
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(deadline, "perf_counter", clock)
+    monkeypatch.setattr(deadline, "enabled", True)
+    monkeypatch.setattr(deadline, "ticks", 0)
+    monkeypatch.setattr(deadline, "late_ticks", 0)
+    monkeypatch.setattr(deadline, "engaged", {step: 0 for step, _ in deadline.LADDER})
+    deadline.configure(0.010)
+    yield clock
+    deadline.configure()
+
+
+def test_ladder_engages_in_order(clock):
+    deadline.start_tick()
+    clock.now += 0.0045
+    assert deadline.degraded(deadline.REUSE_PREDICTION)
+    assert not deadline.degraded(deadline.COARSE_INTERCEPT)
+    clock.now += 0.0035
+    assert deadline.degraded(deadline.SKIP_RENDERING)
+    assert deadline.end_tick() == pytest.approx(0.008)
+    assert deadline.late_ticks == 0
+    assert deadline.engaged[deadline.REUSE_PREDICTION] == 1
+    assert deadline.engaged[deadline.SKIP_RENDERING] == 1
+    assert deadline.engaged[deadline.COARSE_INTERCEPT] == 0
+
+
+def test_slow_tick_does_not_degrade_the_next(clock):
+    deadline.start_tick()
+    clock.now += 0.025 # over twice the budget
+    deadline.end_tick()
+    assert deadline.late_ticks == 1
+
+    deadline.start_tick()
+    clock.now += 0.001
+    assert deadline.elapsed() == pytest.approx(0.001)
+    assert not any(deadline.degraded(step) for step, _ in deadline.LADDER)
+    deadline.end_tick()
+    assert deadline.late_ticks == 1
+
+
+def test_only_the_tick_thread_degrades(clock):
+    deadline.start_tick()
+    clock.now += 0.009
+    results = []
+    thread = threading.Thread(target=lambda: results.append(deadline.degraded(deadline.SKIP_RENDERING)))
+    thread.start()
+    thread.join()
+    assert results == [False]
+    assert deadline.degraded(deadline.SKIP_RENDERING)
+    deadline.end_tick()
+
+
+def test_disabled_or_outside_ticks(clock, monkeypatch):
+    assert not deadline.degraded(deadline.REUSE_PREDICTION)
+    monkeypatch.setattr(deadline, "enabled", False)
+    deadline.start_tick()
+    clock.now += 0.009
+    assert not deadline.degraded(deadline.REUSE_PREDICTION)
+    deadline.end_tick()
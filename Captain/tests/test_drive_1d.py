@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from util.physics import drive_1d
+from util.physics.drive_1d import TIME, DISTANCE, VELOCITY, BOOST
+from util.physics.drive_1d_distance import state_at_distance_vectorized
+from util.physics.drive_1d_time import state_at_time_vectorized
+from util.physics.drive_1d_velocity import state_at_velocity_vectorized
+from util.special_lambertw import lambertw, lambertw_real, EXPN1
+
+
+def test_lambertw_real_matches_lambertw():
+    x = np.concatenate([-EXPN1 + np.logspace(-16, -1, 200), np.linspace(-EXPN1, 0, 2001)[1:-1]])
+    fast = np.array([lambertw_real(value) for value in x])
+    reference = np.array([lambertw(value) for value in x])
+    assert np.abs(fast * np.exp(fast) - x).max() < 1e-12
+    assert np.abs(fast - reference).max() < 1e-3
+
+
+def test_lambertw_real_edges():
+    assert lambertw_real(-EXPN1) == pytest.approx(-1.0)
+    # Outside [-1/e, 0) it falls back to the complex implementation
+    for x in (0.0, 0.5, 3.0):
+        assert lambertw_real(x) == lambertw(x)
+
+
+@pytest.fixture(scope="module")
+def states():
+    rng = np.random.default_rng(0)
+    n = 500
+    return rng.uniform(-2300, 2300, n), rng.uniform(0, 100, n)
+
+
+@pytest.mark.parametrize("kind, x, solver, rows", [
+    ("distance", np.linspace(1, 6000, 500), state_at_distance_vectorized, (TIME, VELOCITY, BOOST)),
+    ("time", np.linspace(0.01, 3, 500), state_at_time_vectorized, (DISTANCE, VELOCITY, BOOST)),
+    ("velocity", np.linspace(-2300, 2300, 500), state_at_velocity_vectorized, (TIME, DISTANCE, BOOST)),
+])
+def test_batch_matches_the_solvers(states, kind, x, solver, rows):
+    v0, boost = states
+    expected = solver(x, v0, boost)
+    x_row, = set(range(4)) - set(rows)
+    for parallel in (False, True):
+        out = drive_1d.batch(kind, x, v0, boost, parallel=parallel)
+        assert np.allclose(out[list(rows)], expected, equal_nan=True)
+        assert np.array_equal(out[x_row], x)
+
+
+def test_batch_broadcasts_and_fills_out():
+    out = np.empty((4, 6))
+    result = drive_1d.batch("distance", np.full((2, 3), 1000.0), 500.0, [0.0, 5.0, 100.0], out=out)
+    assert result is out
+    assert np.array_equal(out[DISTANCE], np.full(6, 1000.0))
+    assert out[TIME, 0] > out[TIME, 1] > out[TIME, 2] # more boost, sooner
+
+
+def test_batch_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        drive_1d.batch("teleport", 1.0, 0.0, 0.0)
+    with pytest.raises(ValueError):
+        drive_1d.batch("distance", [1.0, 2.0], 0.0, 0.0, out=np.empty((4, 3)))
+    with pytest.raises(ValueError):
+        drive_1d.batch("distance", [1.0, 2.0], 0.0, 0.0, out=np.empty((4, 2), dtype=np.float32))
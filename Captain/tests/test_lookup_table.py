@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pytest
+
+from util.lookup_data.acceleration_lut import AccelerationLUT, BOOST, THROTTLE
+from util.lookup_data.lookup_table import LookupTable
+
+COLUMNS = "time,car_loc_x,car_vel_x"
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "table.csv"
+    rows = [f"{i / 120},{i * i * 0.5},{i * 10.0}" for i in range(100)]
+    path.write_text("\n".join([COLUMNS] + rows) + "\n")
+    return path
+
+
+def test_parse_and_cache(csv_file):
+    table = LookupTable(str(csv_file)).table
+    assert table.dtype.names == ("time", "car_loc_x", "car_vel_x")
+    assert csv_file.with_suffix(".npy").exists()
+    assert not list(csv_file.parent.glob("*.tmp"))
+
+    cached = LookupTable(str(csv_file)).table
+    assert isinstance(cached, np.memmap)
+    assert np.array_equal(cached, table)
+
+
+def test_corrupt_cache_falls_back_to_csv(csv_file):
+    expected = LookupTable(str(csv_file)).table
+    cache = csv_file.with_suffix(".npy")
+
+    cache.write_bytes(cache.read_bytes()[:100]) # half written by another process
+    assert np.array_equal(LookupTable(str(csv_file)).table, expected)
+    # and the cache got rewritten
+    assert np.array_equal(np.load(cache), expected)
+
+    cache.write_bytes(b"")
+    assert np.array_equal(LookupTable(str(csv_file)).table, expected)
+
+
+def test_stale_cache_is_rebuilt(csv_file):
+    LookupTable(str(csv_file))
+    csv_file.write_text(f"{COLUMNS}\n0,0,0\n1,2,3\n")
+    cache = csv_file.with_suffix(".npy")
+    csv_mtime = cache.stat().st_mtime + 10
+    os.utime(csv_file, (csv_mtime, csv_mtime))
+    assert len(LookupTable(str(csv_file)).table) == 2
+
+
+@pytest.mark.parametrize("interpolate", [False, True])
+@pytest.mark.parametrize("recorded", [BOOST, THROTTLE], ids=["boost", "throttle"])
+def test_vectorized_matches_scalar(recorded, interpolate):
+    lut = AccelerationLUT.from_columns(recorded.distances, recorded.times, recorded.speeds, interpolate=interpolate)
+    rng = np.random.default_rng(0)
+    speeds = rng.uniform(0, 2200, 200)
+    distances = rng.uniform(1, 5000, 200)
+    times = rng.uniform(0.01, 3, 200)
+
+    result = lut.simulate_until_limit_vectorized(speeds, time_limit=times, distance_limit=distances)
+    for i in range(len(speeds)):
+        expected = lut.simulate_until_limit(speeds[i], time_limit=times[i], distance_limit=distances[i])
+        assert result.speed_reached[i] == pytest.approx(expected.speed_reached)
+        assert result.time_passed[i] == pytest.approx(expected.time_passed)
+        assert result.distance_traveled[i] == pytest.approx(expected.distance_traveled)
+        assert bool(result.distance_limit_reached[i]) == bool(expected.distance_limit_reached)
+        assert bool(result.time_limit_reached[i]) == bool(expected.time_limit_reached)
+
+
+def test_unset_limits_are_ignored():
+    result = BOOST.simulate_until_limit_vectorized(np.array([0.0, 500.0]), distance_limit=np.array([1000.0, 0.0]),
+                                                   time_limit=np.array([0.0, 1.0]))
+    assert result.distance_limit_reached[0] and not result.time_limit_reached[0]
+    assert result.time_limit_reached[1] and not result.distance_limit_reached[1]
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from offline.packets import PacketGenerator, scenario, SCENARIOS, FPS
+from offline.recorder import PacketRecorder, Replay
+
+
+def record(path, generator, ticks, chunk_ticks):
+    recorder = PacketRecorder(path, chunk_ticks=chunk_ticks, metadata={"test": True})
+    expected = []
+    for packet in generator.packets(ticks):
+        recorder.record(packet, generator.field_info())
+        expected.append(bytes(packet))
+    recorder.close()
+    assert recorder.error is None
+    return expected
+
+
+def test_replay_matches_the_recording(tmp_path):
+    path = tmp_path / "match.rlpk"
+    generator = PacketGenerator(scenario("open_play", team_size=3))
+    expected = record(path, generator, ticks=250, chunk_ticks=100) # the last chunk is partial
+
+    replay = Replay(path)
+    assert len(replay) == 250
+    assert replay.header["metadata"] == {"test": True}
+    assert bytes(replay.field_info) == bytes(generator.field_info())
+    assert [bytes(packet) for packet in replay] == expected
+    assert bytes(replay.packet(123)) == expected[123] # out of order, a chunk that isn't cached
+    with pytest.raises(IndexError):
+        replay.packet(250)
+
+    x = replay.column("rest/game_ball/physics/location/x")
+    assert x.shape == (250,) and x[-1] == pytest.approx(generator.ball_location[0])
+    replay.close()
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "garbage.rlpk"
+    path.write_bytes(b"not a recording")
+    with pytest.raises(ValueError):
+        Replay(path)
+
+
+@pytest.mark.parametrize("name", SCENARIOS)
+def test_generator(name):
+    generator = PacketGenerator(scenario(name, team_size=2, seed=1))
+    packet = generator.packet
+    assert packet.num_cars == 4
+    assert [packet.game_cars[i].team for i in range(4)] == [0, 0, 1, 1]
+
+    for _ in range(FPS):
+        assert generator.step() is packet # refilled in place, like RLBot does
+    assert packet.game_info.frame_num == FPS
+    assert packet.game_info.seconds_elapsed == pytest.approx(1.0)
+
+    ball = packet.game_ball.physics.location
+    assert np.isfinite([ball.x, ball.y, ball.z]).all() and ball.z > 0
+    for i in range(4):
+        assert packet.game_cars[i].physics.location.z >= 17 - 1e-3
+        assert 0 <= packet.game_cars[i].boost <= 100
+
+
+def test_same_seed_same_packets():
+    first = [bytes(p) for p in PacketGenerator(scenario("open_play", seed=3)).packets(10)]
+    second = [bytes(p) for p in PacketGenerator(scenario("open_play", seed=3)).packets(10)]
+    assert first == second
+
+
+def test_unknown_scenario():
+    with pytest.raises(ValueError):
+        scenario("rumble")
+    with pytest.raises(ValueError):
+        scenario("kickoff", team_size=0)
@@ -0,0 +1,43 @@
+# Standard soccar arena layout, for code that needs it without a FieldInfoPacket (e.g. synthetic inputs)
+
+# (x, y, z, is_full_boost) of the 34 boost pads, in the order the game reports them
+BOOST_PADS = [
+    (0.0, -4240.0, 70.0, False),
+    (-1792.0, -4184.0, 70.0, False),
+    (1792.0, -4184.0, 70.0, False),
+    (-3072.0, -4096.0, 73.0, True),
+    (3072.0, -4096.0, 73.0, True),
+    (-940.0, -3308.0, 70.0, False),
+    (940.0, -3308.0, 70.0, False),
+    (0.0, -2816.0, 70.0, False),
+    (-3584.0, -2484.0, 70.0, False),
+    (3584.0, -2484.0, 70.0, False),
+    (-1788.0, -2300.0, 70.0, False),
+    (1788.0, -2300.0, 70.0, False),
+    (-2048.0, -1036.0, 70.0, False),
+    (0.0, -1024.0, 70.0, False),
+    (2048.0, -1036.0, 70.0, False),
+    (-3584.0, 0.0, 73.0, True),
+    (-1024.0, 0.0, 70.0, False),
+    (1024.0, 0.0, 70.0, False),
+    (3584.0, 0.0, 73.0, True),
+    (-2048.0, 1036.0, 70.0, False),
+    (0.0, 1024.0, 70.0, False),
+    (2048.0, 1036.0, 70.0, False),
+    (-1788.0, 2300.0, 70.0, False),
+    (1788.0, 2300.0, 70.0, False),
+    (-3584.0, 2484.0, 70.0, False),
+    (3584.0, 2484.0, 70.0, False),
+    (0.0, 2816.0, 70.0, False),
+    (-940.0, 3310.0, 70.0, False),
+    (940.0, 3308.0, 70.0, False),
+    (-3072.0, 4096.0, 73.0, True),
+    (3072.0, 4096.0, 73.0, True),
+    (-1792.0, 4184.0, 70.0, False),
+    (1792.0, 4184.0, 70.0, False),
+    (0.0, 4240.0, 70.0, False),
+]
+
+FIELD_LENGTH = 10240.0
+FIELD_WIDTH = 8192.0
+GOAL_Y = 5120.0
@@ -0,0 +1,138 @@
+import numpy as np
+
+from rlutilities.linear_algebra import vec3
+from rlutilities.simulation import Ball
+
+
+class BallTrajectory:
+    """
+    Ball prediction stored as a struct of preallocated arrays (time, position, velocity and angular velocity)
+    instead of a list of Ball copies. The buffers are reused between ticks and only grow when needed.
+
+    Array consumers read the trimmed arrays directly (e.g. trajectory.position[:, 2]), while code that still wants
+    objects can index / iterate it like the old list and gets Ball objects built lazily from the arrays.
+    """
+
+    def __init__(self, capacity=720):
+        self._time = np.zeros(capacity)
+        self._position = np.zeros((capacity, 3))
+        self._velocity = np.zeros((capacity, 3))
+        self._angular_velocity = np.zeros((capacity, 3))
+
+        self._balls = [None] * capacity # Lazily built Ball objects
+        self.length = 0
+
+    @property
+    def capacity(self):
+        return len(self._time)
+
+    @property
+    def time(self):
+        return self._time[:self.length]
+
+    @property
+    def position(self):
+        return self._position[:self.length]
+
+    @property
+    def velocity(self):
+        return self._velocity[:self.length]
+
+    @property
+    def angular_velocity(self):
+        return self._angular_velocity[:self.length]
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for i in range(self.length):
+            yield self[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("ball trajectory index out of range")
+
+        ball = self._balls[index]
+        if ball is None:
+            ball = self._balls[index] = self.ball_at(index)
+        return ball
+
+    def ball_at(self, index, template=None):
+        # Build a new Ball object from the slice at the given index (copying everything else from template, if given)
+        ball = Ball(template) if template is not None else Ball()
+        ball.time = float(self._time[index])
+        ball.position = vec3(*self._position[index])
+        ball.velocity = vec3(*self._velocity[index])
+        ball.angular_velocity = vec3(*self._angular_velocity[index])
+        return ball
+
+    def view(self, count):
+        # Prefix of this trajectory sharing the same buffers. Only valid until the trajectory is modified again
+        view = BallTrajectory.__new__(BallTrajectory)
+        view._time = self._time
+        view._position = self._position
+        view._velocity = self._velocity
+        view._angular_velocity = self._angular_velocity
+        view._balls = self._balls
+        view.length = min(count, self.length)
+        return view
+
+    def load(self, time, position, velocity, angular_velocity):
+        # Replace the whole trajectory with copies of the given arrays (e.g. a prediction computed by another bot)
+        while self.capacity < len(time):
+            self._grow()
+
+        count = len(time)
+        self._time[:count] = time
+        self._position[:count] = position
+        self._velocity[:count] = velocity
+        self._angular_velocity[:count] = angular_velocity
+        self._balls = [None] * self.capacity
+        self.length = count
+
+    def clear(self):
+        self.length = 0
+        self._balls = [None] * self.capacity
+
+    def append(self, ball):
+        if self.length == self.capacity:
+            self._grow()
+
+        i = self.length
+        position, velocity, angular_velocity = ball.position, ball.velocity, ball.angular_velocity
+        self._time[i] = ball.time
+        self._position[i] = position[0], position[1], position[2]
+        self._velocity[i] = velocity[0], velocity[1], velocity[2]
+        self._angular_velocity[i] = angular_velocity[0], angular_velocity[1], angular_velocity[2]
+        self.length += 1
+
+    def drop(self, count):
+        # Remove the first count slices (i.e. the ones already in the past), keeping the rest at the start of the buffers
+        count = min(count, self.length)
+        remaining = self.length - count
+
+        for buffer in (self._time, self._position, self._velocity, self._angular_velocity):
+            buffer[:remaining] = buffer[count:self.length]
+
+        self._balls = self._balls[count:] + [None] * count
+        self.length = remaining
+
+    def _grow(self):
+        capacity = max(2 * self.capacity, 1)
+
+        def grown(buffer):
+            new_buffer = np.zeros((capacity,) + buffer.shape[1:])
+            new_buffer[:self.length] = buffer[:self.length]
+            return new_buffer
+
+        self._time = grown(self._time)
+        self._position = grown(self._position)
+        self._velocity = grown(self._velocity)
+        self._angular_velocity = grown(self._angular_velocity)
+        self._balls = self._balls + [None] * (capacity - len(self._balls))
@@ -1,10 +1,10 @@
-from skeleton.util.conversion import rotation_to_matrix
+from util.conversion import rotation_to_matrix
 from util.collision_utils import (
     box_ball_collision_distance,
     box_ball_low_location_on_collision,
     box_ball_location_on_collision,
 )
-from util.physics.drive_1d_time import state_at_time_vectorized
+from util.physics.kernels import state_at_time_vectorized
 
 import numpy as np
 
@@ -26,29 +26,10 @@ def available_boost_pads(my_loc: np.ndarray, boost_pads: np.ndarray) -> np.ndarr
 
 
 def main():
-    """Testing for errors and performance"""
+    """Time the functions of this module (see benchmarks)"""
+    from benchmarks import run
 
-    from timeit import timeit
-    from rlbot.utils.structures.game_data_struct import GameTickPacket
-    from skeleton.test.skeleton_agent_test import SkeletonAgentTest, MAX_BOOSTS
-
-    agent = SkeletonAgentTest()
-    game_tick_packet = GameTickPacket()
-    game_tick_packet.num_boost = MAX_BOOSTS
-    agent.initialize_agent()
-
-    def test_function():
-        return closest_available_boost(agent.game_data.my_car.location, agent.game_data.boost_pads)
-
-    test_function()
-
-    fps = 120
-    n_times = 10000
-    time_taken = timeit(test_function, number=n_times)
-    percentage = time_taken * fps / n_times * 100
-
-    print(f"Took {time_taken} seconds to run {n_times} times.")
-    print(f"That's {percentage:.5f} % of our time budget.")
+    run(["boost_utils."])
 
 
 if __name__ == "__main__":
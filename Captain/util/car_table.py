@@ -0,0 +1,75 @@
+"""
+Per car state of the latest packet in a fixed size structured array (util.dtypes.dtype_car) that is allocated once
+and updated in place every tick, straight from the packet's memory through a NumPy view of its game_cars array.
+Nothing is allocated per car per tick and the memory used stays the same over a whole match.
+"""
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+from util.dtypes import dtype_car, dtype_packet_car
+
+MAX_CARS = 64 # length of GameTickPacket.game_cars
+
+
+class CarTable:
+    def __init__(self, team, index):
+        self.team = team
+        self.index = index
+        self.count = 0
+        self.cars = np.zeros(MAX_CARS, dtype=dtype_car)
+
+        # Field views, so updates don't look the fields up every tick
+        self.teams = self.cars["team"]
+        self.location = self.cars["location"]
+        self.velocity = self.cars["velocity"]
+        self.rotation = self.cars["rotation"]
+        self.angular_velocity = self.cars["angular_velocity"]
+        self.boost = self.cars["boost"]
+        self.is_demolished = self.cars["is_demolished"]
+
+        self._packet = None # packet the views below look into (RLBot reuses the same one every tick)
+        self._source = None
+
+    @property
+    def me(self):
+        return self.cars[self.index]
+
+    def update(self, packet):
+        if packet is not self._packet:
+            self._packet = packet
+            self._source = self._views(packet)
+
+        count = self.count = packet.num_cars
+        team, location, velocity, rotation, angular_velocity, boost, is_demolished = self._source
+        self.teams[:count] = team[:count]
+        self.location[:count] = location[:count]
+        self.velocity[:count] = velocity[:count]
+        self.rotation[:count] = rotation[:count]
+        self.angular_velocity[:count] = angular_velocity[:count]
+        self.boost[:count] = boost[:count]
+        self.is_demolished[:count] = is_demolished[:count]
+
+    @staticmethod
+    def _views(packet):
+        raw = np.frombuffer(packet.game_cars, dtype=dtype_packet_car)
+        physics = raw["physics"]
+        return (raw["team"],
+                structured_to_unstructured(physics["location"]),
+                structured_to_unstructured(physics["velocity"]),
+                structured_to_unstructured(physics["rotation"]),
+                structured_to_unstructured(physics["angular_velocity"]),
+                raw["boost"],
+                raw["is_demolished"])
+
+    def allies(self):
+        """Indices of our teammates (not including us)"""
+        indices = np.flatnonzero(self.teams[:self.count] == self.team)
+        return indices[indices != self.index]
+
+    def enemies(self):
+        return np.flatnonzero(self.teams[:self.count] != self.team)
+
+    def first_teammate_before(self, index):
+        """Lowest index of a car in our team before index, None if there is none"""
+        before = np.flatnonzero(self.teams[:min(index, self.count)] == self.team)
+        return int(before[0]) if len(before) else None
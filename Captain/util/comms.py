@@ -0,0 +1,108 @@
+"""
+Non-blocking TMCP comms. A background thread drains the matchcomms incoming queue into a deque, and the tick only
+takes whatever has already arrived (poll()), so a marujo waiting for orders never blocks get_output.
+
+Outgoing messages go through a pending queue flushed once per tick (flush()), at the TMCP rate of one message every
+TIME_BETWEEN_MESSAGES. A newer message for the same receiver replaces one that hasn't gone out yet, so nothing is
+silently dropped by the rate limit.
+
+Our own messages carry the wall clock time they were sent at (an extra key TMCP ignores), which gives the latency
+from send to poll. Messages from other bots are timed from when the receiver thread got them.
+"""
+import threading
+from collections import deque
+from queue import Empty
+from time import perf_counter, time
+from typing import List
+
+import numpy as np
+
+from tmcp import TMCPMessage
+from tmcp.handler import TIME_BETWEEN_MESSAGES
+
+MAX_QUEUED = 256 # messages kept until the tick polls them, the oldest are dropped first
+LATENCY_SAMPLES = 1000
+
+
+class CommsPump:
+    def __init__(self, handler, matchcomms):
+        """handler is the agent's TMCPHandler (team filter, enabled flag), matchcomms its MatchcommsClient"""
+        self.handler = handler
+        self.matchcomms = matchcomms
+        self.incoming = deque(maxlen=MAX_QUEUED) # (message, wall clock time it was sent or received)
+        self.pending = {} # receiver index -> message waiting for the rate limit
+        self.last_sent = -TIME_BETWEEN_MESSAGES
+
+        self.received = 0
+        self.dropped = 0
+        self.sent = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES) # seconds from send (or receive) to poll
+        self.depths = deque(maxlen=LATENCY_SAMPLES) # messages waiting at each poll
+
+        self._running = True
+        self._thread = threading.Thread(target=self._receive, name="tmcp receiver", daemon=True)
+        self._thread.start()
+
+    def poll(self) -> List[TMCPMessage]:
+        """Every message that arrived since the last poll, without waiting for more"""
+        messages = []
+        now = time()
+        self.depths.append(len(self.incoming))
+        while True:
+            try:
+                message, stamp = self.incoming.popleft()
+            except IndexError:
+                break
+            messages.append(message)
+            self.latencies.append(now - stamp)
+        return messages
+
+    def send(self, message: TMCPMessage) -> bool:
+        """Queue the message for its receiver (message.index), it goes out on a later flush() if rate limited"""
+        if not self.handler.enabled:
+            return True
+        self.pending[message.index] = message
+        self.flush()
+        return True
+
+    def flush(self):
+        """Send the oldest pending message if the TMCP rate limit allows it, call once per tick"""
+        if not self.pending or perf_counter() - self.last_sent < TIME_BETWEEN_MESSAGES:
+            return
+
+        index = next(iter(self.pending))
+        message = self.pending.pop(index).to_dict()
+        message["sent"] = time()
+        self.matchcomms.outgoing_broadcast.put_nowait(message)
+        self.last_sent = perf_counter()
+        self.sent += 1
+
+    def close(self):
+        self._running = False
+
+    def report(self) -> str:
+        if not self.latencies:
+            return f"TMCP: {self.sent} sent, nothing received"
+        latencies = np.array(self.latencies) * 1000
+        depths = np.array(self.depths)
+        return (f"TMCP: {self.sent} sent, {self.received} received ({self.dropped} dropped), latency "
+                f"p50 {np.percentile(latencies, 50):.2f} ms, p95 {np.percentile(latencies, 95):.2f} ms, "
+                f"max {latencies.max():.2f} ms, queue depth mean {depths.mean():.2f}, max {depths.max()}")
+
+    def _receive(self):
+        while self._running:
+            try:
+                raw = self.matchcomms.incoming_broadcast.get(timeout=0.5)
+            except Empty:
+                continue
+            if not self.handler.enabled or not isinstance(raw, dict):
+                continue
+
+            message = self.handler.parse(raw)
+            if message is None:
+                continue
+            stamp = raw.get("sent")
+            if len(self.incoming) == self.incoming.maxlen:
+                self.dropped += 1
+            self.incoming.append((message, stamp if isinstance(stamp, float) else time()))
+            self.received += 1
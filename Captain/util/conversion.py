@@ -0,0 +1,16 @@
+import math
+
+import numpy as np
+
+
+def rotation_to_matrix(rotation) -> np.ndarray:
+    """Orientation matrix (columns forward, left, up) of a [pitch, yaw, roll] rotation"""
+    pitch, yaw, roll = rotation
+    cp, cy, cr = math.cos(pitch), math.cos(yaw), math.cos(roll)
+    sp, sy, sr = math.sin(pitch), math.sin(yaw), math.sin(roll)
+
+    return np.array([
+        [cp * cy, cy * sp * sr - cr * sy, -cr * cy * sp - sr * sy],
+        [cp * sy, sy * sp * sr + cr * cy, -cr * sy * sp + sr * cy],
+        [sp, -cp * sr, cp * cr],
+    ])
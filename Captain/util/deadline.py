@@ -0,0 +1,113 @@
+"""
+Tick deadline: how much of the tick budget is gone, so expensive work can degrade before the bot is late
+(when get_output runs long RLBot keeps using our previous inputs).
+
+The agent calls start_tick() / end_tick() around get_output, and the expensive steps ask degraded(step) before
+doing their work. Steps engage in LADDER order as the budget gets used up:
+
+    REUSE_PREDICTION        hand out the last ball prediction instead of simulating a new one
+    COARSE_INTERCEPT        check every Intercept.COARSE_STRIDE-th prediction slice instead of every STRIDE-th
+    SKIP_FLIGHT_SIMULATION  AerialStrike keeps last tick's flight simulation
+    SKIP_RENDERING          no debug drawing this tick
+
+Every tick is judged on its own elapsed time. An overrun isn't carried into the next tick: RLBot hands us the newest
+packet, not the one we missed, and carrying it made one slow tick degrade the ticks after it even when they had
+plenty of time.
+
+Only the thread that started the tick is ever degraded, work on other threads (e.g. policy.planner) is not on the
+clock.
+"""
+import threading
+from time import perf_counter
+
+REUSE_PREDICTION = "reuse_prediction"
+COARSE_INTERCEPT = "coarse_intercept"
+SKIP_FLIGHT_SIMULATION = "skip_flight_simulation"
+SKIP_RENDERING = "skip_rendering"
+
+TICK_BUDGET = 1 / 120
+
+# (step, fraction of the budget after which it engages)
+LADDER = [
+    (REUSE_PREDICTION, 0.4),
+    (COARSE_INTERCEPT, 0.5),
+    (SKIP_FLIGHT_SIMULATION, 0.6),
+    (SKIP_RENDERING, 0.75),
+]
+
+enabled = True
+budget = TICK_BUDGET
+
+_thresholds = {step: fraction * budget for step, fraction in LADDER}
+_start = None # perf_counter() at the start of the current tick, None outside of ticks
+_thread = None # thread running the current tick
+
+ticks = 0
+late_ticks = 0 # ticks that went over the budget
+engaged = {step: 0 for step, _ in LADDER} # ticks each step engaged in
+_engaged_this_tick = set()
+
+
+def configure(tick_budget=TICK_BUDGET, ladder=None):
+    """Set the budget (seconds) and the ladder ((step, fraction of the budget) list, steps left out never engage)"""
+    global budget, LADDER, _thresholds
+    budget = tick_budget
+    if ladder is not None:
+        LADDER = list(ladder)
+    _thresholds = {step: fraction * budget for step, fraction in LADDER}
+    for step, _ in LADDER:
+        engaged.setdefault(step, 0)
+
+
+def start_tick():
+    global _start, _thread
+    _start = perf_counter()
+    _thread = threading.get_ident()
+    _engaged_this_tick.clear()
+
+
+def end_tick() -> float:
+    """Close the tick, returns how long it took"""
+    global _start, ticks, late_ticks
+    if _start is None:
+        return 0.0
+
+    duration = perf_counter() - _start
+    _start = None
+    ticks += 1
+    if duration > budget:
+        late_ticks += 1
+
+    for step in _engaged_this_tick:
+        engaged[step] += 1
+    return duration
+
+
+def elapsed() -> float:
+    """Time used so far in the current tick"""
+    if _start is None:
+        return 0.0
+    return perf_counter() - _start
+
+
+def remaining() -> float:
+    return budget - elapsed()
+
+
+def degraded(step) -> bool:
+    """Whether the step should be cut short this tick. Always False outside of ticks, off the tick's thread or when disabled"""
+    if not enabled or _start is None or step not in _thresholds or threading.get_ident() != _thread:
+        return False
+
+    if perf_counter() - _start > _thresholds[step]:
+        _engaged_this_tick.add(step)
+        return True
+    return False
+
+
+def report() -> str:
+    if not ticks:
+        return "No ticks timed"
+    steps = ", ".join(f"{step} {count / ticks * 100:.1f} %" for step, count in engaged.items())
+    return (f"{late_ticks} of {ticks} ticks ({late_ticks / ticks * 100:.2f} %) over the "
+            f"{budget * 1000:.2f} ms budget. Ticks degraded by: {steps}")
@@ -0,0 +1,47 @@
+import ctypes
+
+import numpy as np
+from rlbot.utils.structures.game_data_struct import PlayerInfo, BoostPadState
+
+
+def ctypes_dtype(ctype) -> np.dtype:
+    """NumPy dtype with the exact layout of a ctypes type (wchar strings become raw bytes, numpy can't map them)"""
+    if issubclass(ctype, ctypes.Structure):
+        fields = ctype._fields_
+        return np.dtype({
+            "names": [name for name, _ in fields],
+            "formats": [ctypes_dtype(field_type) for _, field_type in fields],
+            "offsets": [getattr(ctype, name).offset for name, _ in fields],
+            "itemsize": ctypes.sizeof(ctype),
+        })
+    if issubclass(ctype, ctypes.Array):
+        if ctype._type_ is ctypes.c_wchar:
+            return np.dtype((np.void, ctypes.sizeof(ctype)))
+        return np.dtype((ctypes_dtype(ctype._type_), (ctype._length_,)))
+    return np.dtype(ctype)
+
+
+# Structured array of boost pads, as used by boost_utils and path_finder
+dtype_full_boost = np.dtype([
+    ("location", "<f8", 3),
+    ("is_full_boost", "?"),
+    ("is_active", "?"), # Active means it's available to be picked up
+    ("timer", "<f4"), # Seconds the pad has been inactive
+])
+
+# Per car state of the latest packet, as kept by util.car_table.CarTable
+dtype_car = np.dtype([
+    ("team", "<i4"),
+    ("location", "<f8", 3),
+    ("velocity", "<f8", 3),
+    ("rotation", "<f8", 3), # pitch, yaw, roll
+    ("angular_velocity", "<f8", 3),
+    ("boost", "<f4"),
+    ("is_demolished", "?"),
+])
+
+# Exact layout of a packet's PlayerInfo, to view game_cars as an array (CarTable) or record it (offline.recorder)
+dtype_packet_car = ctypes_dtype(PlayerInfo)
+
+# Exact layout of a packet's BoostPadState, to view game_boosts as an array (GameInfo)
+dtype_packet_boost_state = ctypes_dtype(BoostPadState)
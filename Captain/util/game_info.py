@@ -1,7 +1,13 @@
+import numpy as np
+
 from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
 from rlutilities.simulation import Game, Car, Ball, Pad, Input
 from rlutilities.linear_algebra import vec3, vec2, norm, normalize, cross, rotation, dot, xy
 from util.math import distance
+from util import deadline
+from util.ball_trajectory import BallTrajectory
+from util.intercept import ReachabilityMatrix
+from util.dtypes import dtype_full_boost, dtype_packet_boost_state
 
 class Net:
     def __init__(self, team):
@@ -17,7 +23,37 @@ class Net:
         return pos[1] < -5120.0 if self.team == 0 else pos[1] > 5120.0
 
 
+class BoostPad:
+    """
+    One pad of GameInfo.boost_pads, in place of rlutilities' Pad: the position is fixed, is_active and timer
+    (seconds until the pad is available again) read the array. Built once per match, so the same pad is always the
+    same object.
+    """
+    __slots__ = ("index", "position", "is_full_boost", "_active", "_timer", "_recharge")
+
+    def __init__(self, pads, index):
+        location = pads["location"][index]
+        self.index = index
+        self.position = vec3(location[0], location[1], location[2])
+        self.is_full_boost = bool(pads["is_full_boost"][index])
+        self._active = pads["is_active"]
+        self._timer = pads["timer"]
+        self._recharge = 10.0 if self.is_full_boost else 4.0
+
+    @property
+    def is_active(self):
+        return bool(self._active[self.index])
+
+    @property
+    def timer(self):
+        return self._recharge - float(self._timer[self.index])
+
+
 class GameInfo(Game):
+    # How far the ball can drift from the previous prediction before we stop trusting it in rolling mode
+    ROLLING_POSITION_TOLERANCE = 10.0
+    ROLLING_VELOCITY_TOLERANCE = 25.0
+
     def __init__(self, team):
         super().__init__()
 
@@ -26,28 +62,81 @@ class GameInfo(Game):
         self.enemy_net = Net(1-team)
 
         # Ball predictions
-        self.ball_predictions = []
+        self.ball_trajectory = BallTrajectory() # Reused between ticks, ball_predictions is a view of it
+        self.ball_predictions = self.ball_trajectory.view(0)
         self.scoring = False
         self.getting_scored = False
         self.time_of_goal = -1
 
-        # Boost Pads - contains Pad objects which store position and the time until boost is available
+        # Prediction cache - the full trajectory of the last simulation and the state it was simulated from
+        self.prediction_hits = 0
+        self.prediction_misses = 0
+        self.prediction_extensions = 0
+        self.prediction_reuses = 0
+        self.prediction_adoptions = 0
+        self._prediction_key = None
+        self._prediction_foresight = 0.0
+        self._prediction_dt = None
+        self._prediction_touch_time = -1
+        self._goal_index = -1
+
+        # Arrival times of every car at every slice of ball_predictions, computed on demand (see get_reachability)
+        self._reachability = None
+        self._reachability_key = None
+
+        # Rolling mode - carry the previous trajectory over to the next tick and only simulate the missing tail
+        self.rolling_predictions = False
+        self.latest_touch_time = -1
+
+        # Boost Pads - read from the field info once, then only their state is updated from every packet.
+        # boost_pads is a dtype_full_boost array (location, is_full_boost, is_active, timer - seconds inactive),
+        # large_boost_pads / small_boost_pads contain BoostPad views of it
+        self.boost_pads = np.zeros(0, dtype=dtype_full_boost)
+        self.large_pad_indices = np.zeros(0, dtype=int)
+        self.small_pad_indices = np.zeros(0, dtype=int)
+        self.pad_order = np.zeros(0, dtype=int)
+        self.pad_recharge_times = np.zeros(0)
+        self.boost_pad_views = []
         self.large_boost_pads = []
         self.small_boost_pads = []
+        self._field_info = None
+        self._boost_packet = None # packet the boost state view looks into
+        self._boost_states = None
 
 
     def read_packet(self, packet: GameTickPacket, field_info: FieldInfoPacket):
         # Get updated information about the game
         self.read_game_information(packet, field_info)
-        
-        self.large_boost_pads = [self.pads[i] for i in range(field_info.num_boosts) if field_info.boost_pads[i].is_full_boost]
-        self.small_boost_pads = [self.pads[i] for i in range(field_info.num_boosts) if not field_info.boost_pads[i].is_full_boost]
-
-        # Update boost pad timers
-        for pad in self.large_boost_pads:
-            pad.timer = 10.0 - pad.timer
-        for pad in self.small_boost_pads:
-            pad.timer = 4.0 - pad.timer
+        self.latest_touch_time = packet.game_ball.latest_touch.time_seconds
+
+        # The field layout doesn't change during a match
+        if field_info is not self._field_info or field_info.num_boosts != len(self.boost_pads):
+            self._read_field_info(field_info)
+
+        # Update boost pad states in place
+        if packet is not self._boost_packet:
+            self._boost_packet = packet
+            self._boost_states = np.frombuffer(packet.game_boosts, dtype=dtype_packet_boost_state)
+        count = len(self.boost_pads)
+        self.boost_pads["is_active"] = self._boost_states["is_active"][:count]
+        self.boost_pads["timer"] = self._boost_states["timer"][:count]
+
+    def _read_field_info(self, field_info: FieldInfoPacket):
+        self._field_info = field_info
+        pads = np.zeros(field_info.num_boosts, dtype=dtype_full_boost)
+        for i in range(field_info.num_boosts):
+            pad = field_info.boost_pads[i]
+            pads["location"][i] = pad.location.x, pad.location.y, pad.location.z
+            pads["is_full_boost"][i] = pad.is_full_boost
+
+        self.boost_pads = pads
+        self.large_pad_indices = np.flatnonzero(pads["is_full_boost"])
+        self.small_pad_indices = np.flatnonzero(~pads["is_full_boost"])
+        self.pad_order = np.concatenate((self.large_pad_indices, self.small_pad_indices)) # large pads first
+        self.pad_recharge_times = np.where(pads["is_full_boost"], 10.0, 4.0)
+        self.boost_pad_views = [BoostPad(pads, i) for i in range(len(pads))]
+        self.large_boost_pads = [self.boost_pad_views[i] for i in self.large_pad_indices]
+        self.small_boost_pads = [self.boost_pad_views[i] for i in self.small_pad_indices]
 
 
     def get_teammates(self, car):
@@ -59,20 +148,167 @@ class GameInfo(Game):
 
     def predict_ball(self, foresight=5.0, dt=1/120):
         # Predict where the ball will be in the specified duration with intervals of dt (1/120) s
-        self.ball_predictions = []
-        prediction = Ball(self.ball)
+        # Several calls can happen within the same tick, so we only simulate when the ball state, game time or dt change
+        # or when asked to look further ahead than the cached trajectory
+        key = self._prediction_state(dt)
+        trajectory = self.ball_trajectory
+
+        if key == self._prediction_key and foresight <= self._prediction_foresight:
+            self.prediction_hits += 1
+        elif self._reuse_ball(dt):
+            self.prediction_reuses += 1
+            self._prediction_key = key
+            self._prediction_foresight = trajectory.time[-1] - self.time
+            self._goal_index = self._find_goal()
+        else:
+            if self.rolling_predictions and self._extend_ball(foresight, dt):
+                self.prediction_extensions += 1
+            else:
+                self.prediction_misses += 1
+                self._simulate_ball(foresight, dt)
+
+            self._prediction_key = key
+            self._prediction_dt = dt
+            self._prediction_touch_time = self.latest_touch_time
+            self._prediction_foresight = trajectory.time[-1] - self.time if len(trajectory) else foresight
+            self._goal_index = self._find_goal()
+
+        # Only hand out the slices that fall within the requested foresight
+        count = 0
+        if self.ball.time < self.time + foresight:
+            count = min(np.searchsorted(trajectory.time, self.time + foresight) + 1, len(trajectory))
+        self.ball_predictions = trajectory.view(count)
 
+        self.scoring = False
+        self.getting_scored = False
+        self.time_of_goal = -1
+        if -1 < self._goal_index < count:
+            self.time_of_goal = trajectory.time[self._goal_index]
+            if self.net.check_inside(trajectory.position[self._goal_index]): #If the ball is predicted to go inside our net
+                self.getting_scored = True
+            else: #If the ball is predicted to go inside enemy net
+                self.scoring = True
+
+    @property
+    def prediction_dt(self):
+        # Time step of the current ball predictions
+        return self._prediction_dt
+
+    @property
+    def prediction_key(self):
+        # Everything the current ball predictions were simulated from, changes whenever they do
+        return self._prediction_key
+
+    def adopt_prediction(self, time, position, velocity, angular_velocity, foresight, dt, reachable=None, stride=None):
+        # Use a ball trajectory simulated elsewhere (e.g. published by the captain, see util.shared_world) as if
+        # predict_ball had simulated it this tick, together with the reachable rows of every car if given.
+        # Slices already in the past are dropped (a multiple of stride of them, so the rows stay aligned)
+        skip = int(np.searchsorted(time, self.ball.time - dt / 2))
+        if reachable is not None:
+            skip -= skip % stride
+        if len(time) - skip < 2:
+            return False
+
+        self.ball_trajectory.load(time[skip:], position[skip:], velocity[skip:], angular_velocity[skip:])
+        self._prediction_key = self._prediction_state(dt)
+        self._prediction_dt = dt
+        self._prediction_touch_time = self.latest_touch_time
+        self._prediction_foresight = foresight
+        self._goal_index = self._find_goal()
+        self.prediction_adoptions += 1
+        self.predict_ball(foresight, dt)
+
+        if reachable is not None:
+            columns = -(-len(self.ball_predictions) // stride)
+            cars = [self.cars[i] for i in range(self.num_cars)]
+            self._reachability = ReachabilityMatrix.precomputed(cars, self.ball_predictions,
+                                                                reachable[:, skip // stride:][:, :columns], stride)
+            self._reachability_key = (self._prediction_key, len(self.ball_predictions))
+        return True
+
+    def _prediction_state(self, dt):
+        # Everything the simulated trajectory depends on
+        ball = self.ball
+        return (
+            self.time, dt, ball.time,
+            ball.position[0], ball.position[1], ball.position[2],
+            ball.velocity[0], ball.velocity[1], ball.velocity[2],
+            ball.angular_velocity[0], ball.angular_velocity[1], ball.angular_velocity[2]
+        )
+
+    def _simulate_ball(self, foresight, dt):
+        self.ball_trajectory.clear()
+        self._step_ball(Ball(self.ball), foresight, dt)
+
+    def _extend_ball(self, foresight, dt):
+        # Reuse the previous trajectory if nobody touched the ball and it is still following the predicted path
+        trajectory = self.ball_trajectory
+        if not len(trajectory) or dt != self._prediction_dt or self.latest_touch_time != self._prediction_touch_time:
+            return False
+
+        # Find the slice that corresponds to the current time
+        ball = self.ball
+        index = np.searchsorted(trajectory.time, ball.time - dt / 2)
+        if index >= len(trajectory) - 1 or trajectory.time[index] > ball.time + dt / 2:
+            return False
+
+        offset = ball.time - trajectory.time[index]
+        expected_position = trajectory.position[index] + trajectory.velocity[index] * offset
+        if (
+            np.linalg.norm(expected_position - (ball.position[0], ball.position[1], ball.position[2])) > self.ROLLING_POSITION_TOLERANCE
+            or np.linalg.norm(trajectory.velocity[index] - (ball.velocity[0], ball.velocity[1], ball.velocity[2])) > self.ROLLING_VELOCITY_TOLERANCE
+        ):
+            return False
+
+        # Drop the slices that are already in the past and only simulate the missing tail
+        trajectory.drop(index + 1)
+        self._step_ball(trajectory.ball_at(len(trajectory) - 1, template=ball), foresight, dt)
+        return True
+
+    def _reuse_ball(self, dt):
+        # Under tick budget pressure (see util.deadline) hand out what is left of the last trajectory instead of
+        # simulating a new one, unless somebody touched the ball since
+        trajectory = self.ball_trajectory
+        if not len(trajectory) or dt != self._prediction_dt or self.latest_touch_time != self._prediction_touch_time:
+            return False
+
+        index = np.searchsorted(trajectory.time, self.ball.time - dt / 2)
+        if index >= len(trajectory) - 1 or not deadline.degraded(deadline.REUSE_PREDICTION):
+            return False
+
+        trajectory.drop(index)
+        return True
+
+    def _step_ball(self, prediction, foresight, dt):
         while(prediction.time < self.time + foresight):
             prediction.step(dt)
-            self.ball_predictions.append(Ball(prediction))
-
-            if self.time_of_goal == -1:
-                if self.net.check_inside(prediction.position): #If the ball is predicted to go inside our net
-                    self.getting_scored = True
-                    self.time_of_goal = prediction.time
-                elif self.enemy_net.check_inside(prediction.position): #If the ball is predicted to go inside enemy net
-                    self.scoring = True
-                    self.time_of_goal = prediction.time
+            self.ball_trajectory.append(prediction)
+
+    def _find_goal(self):
+        # Index of the first slice inside either net, -1 if there is none
+        inside = np.abs(self.ball_trajectory.position[:, 1]) > 5120.0
+        return int(np.argmax(inside)) if inside.any() else -1
+
+    def get_reachability(self):
+        # Reachability of the current ball predictions for all cars, only recomputed when the predictions change
+        key = (self._prediction_key, len(self.ball_predictions))
+        if key != self._reachability_key:
+            self._reachability = ReachabilityMatrix([self.cars[i] for i in range(self.num_cars)], self.ball_predictions)
+            self._reachability_key = key
+        return self._reachability
+
+    def cached_reachability(self):
+        # The reachability matrix if it was already computed for the current ball predictions, None otherwise
+        if self._reachability_key != (self._prediction_key, len(self.ball_predictions)):
+            return None
+        return self._reachability
+
+    def prediction_stats(self):
+        # How many predict_ball calls were served from the cache, extended from the last tick, reused under budget
+        # pressure or simulated from scratch, and how many trajectories were adopted from elsewhere
+        return {"hits": self.prediction_hits, "extensions": self.prediction_extensions,
+                "reuses": self.prediction_reuses, "misses": self.prediction_misses,
+                "adoptions": self.prediction_adoptions}
     
     def predict_car(self, index, foresight=2.0, dt=1/60):
         # Predict where a given car will be in the specified duration with interval of dt (1/60) s
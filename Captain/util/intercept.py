@@ -1,30 +1,50 @@
 import math
 
+import numpy as np
+
 from util.lookup_data.acceleration_lut import AccelerationLUT, BOOST, THROTTLE
+from util.lookup_data.arrival_time_table import arrival_times
 from rlutilities.linear_algebra import norm, angle_between, dot
 from rlutilities.mechanics import Aerial, Drive
 from rlutilities.simulation import Car, Ball
 
 from util.math import distance, direction, ground, ground_distance, clamp
+from util.physics import warmup
+from util import deadline
+
+# Backends for estimate_time / estimate_times_for_cars, see set_backend
+LUT = "lut" # boost and throttle phases through the acceleration LUTs
+TABLE = "table" # precomputed arrival time table (util.lookup_data.arrival_time_table)
+ANALYTIC = "analytic" # fused numba kernel over the drive_1d solvers (util.physics.arrival_time)
+
+BACKEND = LUT
 
 
 class Intercept:
-    def __init__(self, car, ball_predictions, predicate = None, backwards=False):
+    STRIDE = 3 # Only every STRIDE-th prediction slice is checked
+    COARSE_STRIDE = 6 # Used instead when the tick is running out of budget (see util.deadline)
+
+    def __init__(self, car, ball_predictions, predicate = None, backwards=False, reachable=None, stride=None):
+        stride = stride or current_stride()
         self.ball = None
         self.car = car
         self.is_viable = True
         self.predicate_later_than_time = False  # whether the time constraint was satisfied sooner than the predicate
 
-        for i in range(0, len(ball_predictions), 3):
-            ball = ball_predictions[i]
-            time = estimate_time(car, ball.position, -1 if backwards else 1)
-            if time < ball.time - car.time:
-                if predicate is None or predicate(car, ball):
-                    self.ball = ball
-                    break
-                self.predicate_later_than_time = True
-            else:
-                self.predicate_later_than_time = False
+        # Estimate the arrival time for every checked slice at once, then only run the predicate on reachable slices
+        # (reachable can also be handed in precomputed, e.g. by a ReachabilityMatrix)
+        if reachable is None:
+            estimates = estimate_times(car, ball_predictions.position[::stride], -1 if backwards else 1)
+            reachable = estimates < ball_predictions.time[::stride] - car.time
+
+        for i in np.flatnonzero(reachable):
+            ball = ball_predictions[i * stride]
+            if predicate is None or predicate(car, ball):
+                self.ball = ball
+                self.predicate_later_than_time = i > 0 and bool(reachable[i - 1])
+                break
+        else:
+            self.predicate_later_than_time = len(reachable) > 0 and bool(reachable[-1])
 
         # if no slice is found, use the last one
         if self.ball is None:
@@ -40,10 +60,101 @@ class Intercept:
         self.position = self.ball.position
 
 
+def current_stride():
+    # Prediction slice stride for this tick
+    return Intercept.COARSE_STRIDE if deadline.degraded(deadline.COARSE_INTERCEPT) else Intercept.STRIDE
+
+
+class ReachabilityMatrix:
+    """
+    Arrival time of every car at every (checked) slice of a ball trajectory, computed in a single vectorized call.
+    Lets the policy get each car's earliest intercept and who gets to the ball first without rescanning the
+    trajectory once per car.
+    """
+
+    def __init__(self, cars, ball_predictions, stride=None):
+        stride = stride or current_stride()
+        self.cars = list(cars)
+        self.ball_predictions = ball_predictions
+        self.stride = stride
+        self.rows = {car.id: row for row, car in enumerate(self.cars)}
+
+        slice_times = ball_predictions.time[::stride]
+        self.times = estimate_times_for_cars(self.cars, ball_predictions.position[::stride])
+        self.reachable = self.times < slice_times[None, :] - np.array([[car.time] for car in self.cars])
+        self._find_earliest_times()
+
+    @classmethod
+    def precomputed(cls, cars, ball_predictions, reachable, stride):
+        # Matrix from reachable rows computed elsewhere (e.g. by the captain, see util.shared_world)
+        matrix = cls.__new__(cls)
+        matrix.cars = list(cars)
+        matrix.ball_predictions = ball_predictions
+        matrix.stride = stride
+        matrix.rows = {car.id: row for row, car in enumerate(matrix.cars)}
+        matrix.times = None # arrival times aren't shared, only whether they make it
+        matrix.reachable = reachable
+        matrix._find_earliest_times()
+        return matrix
+
+    def _find_earliest_times(self):
+        # Time of each car's earliest intercept (same as Intercept.time without a predicate)
+        slice_times = self.ball_predictions.time[::self.stride]
+        if len(slice_times):
+            first = np.argmax(self.reachable, axis=1)
+            self.earliest_times = np.where(self.reachable.any(axis=1), slice_times[first], self.ball_predictions.time[-1])
+        else:
+            self.earliest_times = np.full(len(self.cars), math.inf)
+
+    def intercept(self, car, predicate=None):
+        # Earliest intercept of the given car (a new Intercept every call, the expensive part is already done)
+        return Intercept(car, self.ball_predictions, predicate, reachable=self.reachable[self.rows[car.id]], stride=self.stride)
+
+    def earliest_time(self, car):
+        return self.earliest_times[self.rows[car.id]]
+
+    def first_to_ball(self, cars):
+        # The car (out of the given ones) that can get to the ball the soonest
+        return min(cars, key=self.earliest_time)
+
+
+def set_backend(backend, log=None):
+    # ANALYTIC starts the numba warm-up (log gets its report), and falls back to the LUT until it's done.
+    # The other backends never touch numba, so nothing gets compiled or loaded for them
+    global BACKEND
+    if backend == ANALYTIC:
+        warmup.start(log)
+    elif backend == TABLE:
+        arrival_times() # loading the table takes a few ticks' worth of time, not in the middle of one
+    BACKEND = backend
+
+
+def active_backend():
+    if BACKEND == ANALYTIC and not warmup.READY.is_set():
+        return LUT
+    return BACKEND
+
+
 def estimate_time(car, target, dd=1):
+    return ESTIMATE_TIME[active_backend()](car, target, dd)
+
+
+def estimate_times_for_cars(cars, targets, dd=1):
+    """
+    Estimated arrival times of every car at every row of targets, as a (number of cars) x (number of targets) array.
+    """
+    return ESTIMATE_TIMES_FOR_CARS[active_backend()](cars, targets, dd)
+
+
+def turning_time(car, target, dd=1):
     turning_radius = 1 / Drive.max_turning_curvature(norm(car.velocity) + 500)
     turning = angle_between(car.forward() * dd, direction(car, target)) * turning_radius / 1800
     if turning < 0.5: turning = 0
+    return turning
+
+
+def estimate_time_lut(car, target, dd=1):
+    turning = turning_time(car, target, dd)
 
     dist = ground_distance(car, target) - 200
     if dist < 0: return turning
@@ -67,4 +178,184 @@ def estimate_time(car, target, dd=1):
     if result is None or not result.distance_limit_reached:
         time += dist / speed
 
-    return time * 1.05 + turning
\ No newline at end of file
+    return time * 1.05 + turning
+
+
+def estimate_time_table(car, target, dd=1):
+    """
+    Drop-in replacement for estimate_time that reads the boost and throttle phases from the precomputed
+    arrival time table instead of running them through the acceleration LUTs.
+    """
+    turning = turning_time(car, target, dd)
+
+    dist = ground_distance(car, target) - 200
+    if dist < 0: return turning
+    speed = dot(car.velocity, car.forward())
+    boost = car.boost if dd > 0 else 0
+
+    return arrival_times().time(dist, speed, boost) * 1.05 + turning
+
+
+def estimate_times(car, targets, dd=1):
+    """
+    Vectorized estimate_time - estimated arrival times of the car at every row of targets (an n x 3 array).
+    Goes through the exact same steps as estimate_time (with the same backend), just for all targets at once.
+    """
+    return estimate_times_for_cars([car], targets, dd)[0]
+
+
+def _drive_inputs(cars, targets, dd):
+    # (cars x targets) turning times, distances left to drive and forward speeds, plus each car's boost
+    def as_array(vectors):
+        return np.array([[vector[0], vector[1], vector[2]] for vector in vectors]).reshape(-1, 3)
+
+    position = as_array(car.position for car in cars)
+    forward = as_array(car.forward() for car in cars) * dd
+    velocity = as_array(car.velocity for car in cars)
+    boost = np.array([car.boost for car in cars], dtype=np.float64)
+
+    turning_radius = np.array([1 / Drive.max_turning_curvature(norm(car.velocity) + 500) for car in cars])
+
+    to_target = targets[None, :, :] - position[:, None, :]
+    target_distance = np.maximum(np.linalg.norm(to_target, axis=2), 1e-9)
+    forward_length = np.maximum(np.linalg.norm(forward, axis=1), 1e-9)
+    cos_angle = np.einsum("cnk,ck->cn", to_target, forward) / (target_distance * forward_length[:, None])
+    turning = np.arccos(np.clip(cos_angle, -1, 1)) * turning_radius[:, None] / 1800
+    turning[turning < 0.5] = 0
+
+    dist = np.linalg.norm(to_target[:, :, :2], axis=2) - 200
+    close = dist < 0
+    speed = np.repeat(np.sum(velocity * forward, axis=1) / dd, len(targets)).reshape(dist.shape)
+
+    return turning, dist, close, speed, boost
+
+
+def estimate_times_for_cars_lut(cars, targets, dd=1):
+    turning, dist, close, speed, boost = _drive_inputs(cars, targets, dd)
+
+    time = np.zeros(dist.shape)
+    has_result = np.zeros(dist.shape, dtype=bool)
+    limit_reached = np.zeros(dist.shape, dtype=bool)
+
+    boosting = (boost > 0) & (dd > 0)
+    if boosting.any():
+        boost_time = boost[boosting, None] / 33.33
+        result = BOOST.simulate_until_limit_vectorized(speed[boosting], distance_limit=dist[boosting], time_limit=boost_time)
+        dist[boosting] -= result.distance_traveled
+        time[boosting] += result.time_passed
+        speed[boosting] = result.speed_reached
+        has_result[boosting] = True
+        limit_reached[boosting] = result.distance_limit_reached
+
+    throttling = (dist > 0) & (speed < 1410)
+    if throttling.any():
+        result = THROTTLE.simulate_until_limit_vectorized(speed[throttling], distance_limit=dist[throttling])
+        dist[throttling] -= result.distance_traveled
+        time[throttling] += result.time_passed
+        speed[throttling] = result.speed_reached
+        has_result[throttling] = True
+        limit_reached[throttling] = result.distance_limit_reached
+
+    cruising = ~has_result | ~limit_reached
+    time[cruising] += dist[cruising] / speed[cruising]
+
+    # targets that are already within reach only cost the turning time
+    return np.where(close, turning, time * 1.05 + turning)
+
+
+def estimate_times_for_cars_table(cars, targets, dd=1):
+    """Same as estimate_times_for_cars, using the arrival time table like estimate_time_table"""
+    turning, dist, close, speed, boost = _drive_inputs(cars, targets, dd)
+    boost = boost if dd > 0 else np.zeros_like(boost)
+
+    time = arrival_times().time_vectorized(dist, speed, boost[:, None])
+    return np.where(close, turning, time * 1.05 + turning)
+
+
+def car_rows(cars, dd=1):
+    # Cars packed into the rows taken by the numba kernels (see util.physics.arrival_time)
+    rows = np.empty((len(cars), 9))
+    for row, car in zip(rows, cars):
+        position, forward, velocity = car.position, car.forward(), car.velocity
+        row[0:3] = position[0], position[1], position[2]
+        row[3:6] = forward[0] * dd, forward[1] * dd, forward[2] * dd
+        row[6] = dot(velocity, forward)
+        row[7] = car.boost if dd > 0 else 0
+        row[8] = 1 / Drive.max_turning_curvature(norm(velocity) + 500)
+    return rows
+
+
+def estimate_time_analytic(car, target, dd=1):
+    """Same as estimate_time, computed entirely in the fused numba kernel"""
+    row = car_rows([car], dd)[0]
+    return warmup.kernels.estimate_time(*row, target[0], target[1], target[2])
+
+
+def estimate_times_for_cars_analytic(cars, targets, dd=1):
+    return warmup.kernels.estimate_times_vectorized(car_rows(cars, dd), np.ascontiguousarray(targets, dtype=np.float64))
+
+
+ESTIMATE_TIME = {LUT: estimate_time_lut, TABLE: estimate_time_table, ANALYTIC: estimate_time_analytic}
+ESTIMATE_TIMES_FOR_CARS = {
+    LUT: estimate_times_for_cars_lut,
+    TABLE: estimate_times_for_cars_table,
+    ANALYTIC: estimate_times_for_cars_analytic,
+}
+
+
+def main():
+    """Check that the vectorized intercept search matches the scalar one and time it (see benchmarks)"""
+
+    from benchmarks import run
+    from benchmarks.intercept import INTERCEPT_CARS, scalar_intercept
+    from rlutilities.linear_algebra import vec3
+    from util.ball_trajectory import BallTrajectory
+
+    ball = Ball()
+    ball.position = vec3(0, 0, 1000)
+    ball.velocity = vec3(800, 1200, 500)
+    trajectory = BallTrajectory()
+    for _ in range(600):
+        ball.step(1 / 120)
+        trajectory.append(ball)
+
+    cars = []
+    for i in range(6):
+        car = Car()
+        car.position = vec3(-3000 + 1200 * i, -4000 + 1500 * (i % 2), 17)
+        car.velocity = vec3(0, 300 * i, 0)
+        car.boost = 20 * i
+        cars.append(car)
+
+    targets = trajectory.position[::3]
+    lut_estimates = estimate_times_for_cars_lut(cars, targets)
+
+    for backend in (LUT, TABLE, ANALYTIC):
+        set_backend(backend)
+        if backend == ANALYTIC:
+            warmup.start().join()
+        print(f"{backend} backend:")
+
+        for car in cars:
+            expected = [estimate_time(car, trajectory[i].position) for i in range(0, len(trajectory), 3)]
+            assert np.allclose(expected, estimate_times(car, targets), rtol=1e-4, atol=1e-4)
+            assert scalar_intercept(car, trajectory).time == Intercept(car, trajectory).time
+
+        difference = np.abs(estimate_times_for_cars(cars, targets) - lut_estimates).mean() * 1000
+        print(f"mean difference to the LUT estimates {difference:.1f} ms")
+
+    results = run(["intercept."])["results"]
+    set_backend(LUT)
+
+    print()
+    for num_cars in INTERCEPT_CARS:
+        scalar = results[f"intercept.Intercept_scalar_{num_cars}_cars"]
+        vectorized = results[f"intercept.Intercept_vectorized_{num_cars}_cars"]
+        if "seconds_per_run" in scalar and "seconds_per_run" in vectorized:
+            print(f"{num_cars} car(s): scalar {scalar['budget_percent']:.3f} % of our time budget, "
+                  f"vectorized {vectorized['budget_percent']:.3f} % "
+                  f"({scalar['seconds_per_run'] / vectorized['seconds_per_run']:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
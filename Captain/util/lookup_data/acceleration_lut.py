@@ -1,23 +1,47 @@
-from dataclasses import dataclass
+from bisect import bisect_left
+from typing import List, NamedTuple
+
+import numpy as np
 
 from util.lookup_data.lookup_table import LookupTable
 
 
 class AccelerationLUT(LookupTable):
-    def __init__(self, file_name: str):
+    """
+    Straight line acceleration recorded at 1/120 s steps.
+    With interpolate=True queries interpolate linearly between rows instead of snapping to the nearest one.
+    """
+
+    def __init__(self, file_name: str, interpolate: bool = False):
         super().__init__(file_name)
-        self.distances = self.get_column('car_loc_x')
-        self.times = self.get_column('time')
-        self.speeds = self.get_column('car_vel_x')
-        assert self.distances and self.times and self.speeds
+        self.set_columns(self.get_column('car_loc_x'), self.get_column('time'), self.get_column('car_vel_x'))
+        self.interpolate = interpolate
+
+    @classmethod
+    def from_columns(cls, distances, times, speeds, interpolate: bool = False) -> 'AccelerationLUT':
+        # Table built straight from arrays instead of a CSV file (e.g. a subset of another table)
+        lut = cls.__new__(cls)
+        lut.file_name = lut.table = None
+        lut.set_columns(np.array(distances, dtype=np.float64), np.array(times, dtype=np.float64),
+                        np.array(speeds, dtype=np.float64))
+        lut.interpolate = interpolate
+        return lut
+
+    def set_columns(self, distances: np.ndarray, times: np.ndarray, speeds: np.ndarray):
+        self.distances = distances
+        self.times = times
+        self.speeds = speeds
+        assert len(self.distances) and len(self.times) and len(self.speeds)
 
         # shift times so that it starts at 0
-        t0 = self.times[0]
-        for i in range(len(self.times)):
-            self.times[i] -= t0
+        self.times -= self.times[0]
 
-    @dataclass
-    class LookupResult:
+        # Plain list copies for the scalar queries, where bisect on a list beats calling into numpy
+        self._distance_list = self.distances.tolist()
+        self._time_list = self.times.tolist()
+        self._speed_list = self.speeds.tolist()
+
+    class LookupResult(NamedTuple):
         speed_reached: float
         time_passed: float = 0.0
         distance_traveled: float = 0.0
@@ -42,30 +66,250 @@ class AccelerationLUT(LookupTable):
 
         if speed_limit: assert speed_limit > initial_speed
 
-        starting_index = self.find_index(self.speeds, initial_speed)
+        if self.interpolate:
+            return self._simulate_interpolated(initial_speed, time_limit, distance_limit, speed_limit)
 
-        initial_time = self.times[starting_index]
-        initial_distance = self.distances[starting_index]
+        distances, times, speeds = self._distance_list, self._time_list, self._speed_list
+        starting_index = self.find_index(speeds, initial_speed)
 
-        last_index = len(self.times) - 1
+        initial_time = times[starting_index]
+        initial_distance = distances[starting_index]
+
+        last_index = len(times) - 1
         time_limit_index = distance_limit_index = speed_limit_index = last_index
 
-        if time_limit: time_limit_index = self.find_index(self.times, initial_time + time_limit)
-        if distance_limit: distance_limit_index = self.find_index(self.distances, initial_distance + distance_limit)
-        if speed_limit: speed_limit_index = self.find_index(self.speeds, speed_limit)
+        if time_limit: time_limit_index = self.find_index(times, initial_time + time_limit)
+        if distance_limit: distance_limit_index = self.find_index(distances, initial_distance + distance_limit)
+        if speed_limit: speed_limit_index = self.find_index(speeds, speed_limit)
 
         final_index = min(time_limit_index, distance_limit_index, speed_limit_index)  # use the soonest reached limit
         if final_index < starting_index: final_index = starting_index
 
+        return self.LookupResult(
+            speeds[final_index],
+            times[final_index] - initial_time,
+            distances[final_index] - initial_distance,
+            speed_limit and final_index == speed_limit_index < last_index,
+            time_limit and final_index == time_limit_index < last_index,
+            distance_limit and final_index == distance_limit_index < last_index
+        )
+
+    def _simulate_interpolated(self, initial_speed, time_limit, distance_limit, speed_limit) -> LookupResult:
+        # Same as simulate_until_limit, but working with times interpolated between the rows instead of row indices.
+        # Columns read at the same time share the row search
+        distances, times, speeds = self._distance_list, self._time_list, self._speed_list
+        locate, lerp = self.locate, self.lerp
+
+        i, fraction = locate(speeds, initial_speed)
+        initial_time = times[i - 1] + (times[i] - times[i - 1]) * fraction
+        initial_distance = distances[i - 1] + (distances[i] - distances[i - 1]) * fraction
+
+        last_time = times[-1]
+        time_limit_time = distance_limit_time = speed_limit_time = last_time
+
+        if time_limit: time_limit_time = min(initial_time + time_limit, last_time)
+        if distance_limit: distance_limit_time = lerp(distances, times, initial_distance + distance_limit)
+        if speed_limit: speed_limit_time = lerp(speeds, times, speed_limit)
+
+        final_time = min(time_limit_time, distance_limit_time, speed_limit_time)  # use the soonest reached limit
+        if final_time < initial_time: final_time = initial_time
+
+        i, fraction = locate(times, final_time)
+        return self.LookupResult(
+            speeds[i - 1] + (speeds[i] - speeds[i - 1]) * fraction,
+            final_time - initial_time,
+            distances[i - 1] + (distances[i] - distances[i - 1]) * fraction - initial_distance,
+            speed_limit and final_time == speed_limit_time < last_time,
+            time_limit and final_time == time_limit_time < last_time,
+            distance_limit and final_time == distance_limit_time < last_time
+        )
+
+    @staticmethod
+    def locate(xs: List[float], x: float):
+        # Row i and fraction of the way from row i - 1 to it where x is in the sorted list (clamped like lerp)
+        i = bisect_left(xs, x, 1, len(xs) - 1)
+        x0, x1 = xs[i - 1], xs[i]
+        if x <= x0: return i, 0.0
+        if x >= x1: return i, 1.0
+        return i, (x - x0) / (x1 - x0)
+
+    @staticmethod
+    def lerp(xs: List[float], ys: List[float], x: float) -> float:
+        # Scalar np.interp for sorted lists (clamped to the ends of the table)
+        i = bisect_left(xs, x, 1, len(xs) - 1)
+        x0, x1 = xs[i - 1], xs[i]
+        if x <= x0: return ys[i - 1]
+        if x >= x1: return ys[i]
+        return ys[i - 1] + (ys[i] - ys[i - 1]) * ((x - x0) / (x1 - x0))
+
+    @staticmethod
+    def lerp_vectorized(xs: np.ndarray, ys: np.ndarray, x) -> np.ndarray:
+        # Vectorized lerp (unlike np.interp, it handles repeated xs the same way as the scalar one)
+        i = np.clip(np.searchsorted(xs, x), 1, len(xs) - 1)
+        x0, x1 = xs[i - 1], xs[i]
+        y0, y1 = ys[i - 1], ys[i]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.where(x <= x0, 0.0, np.where(x >= x1, 1.0, (x - x0) / (x1 - x0)))
+        return y0 + (y1 - y0) * fraction
+
+    def simulate_until_limit_vectorized(self,
+                                        initial_speed,
+                                        time_limit=None,
+                                        distance_limit=None,
+                                        speed_limit=None) -> LookupResult:
+        """
+        Same as simulate_until_limit, but every argument can be an array (or a scalar that gets broadcast).
+        Limits that are zero or negative count as not set, just like a falsy limit in the scalar version.
+        Returns a LookupResult whose fields are arrays.
+        """
+        initial_speed = np.asarray(initial_speed, dtype=np.float64)
+        if self.interpolate:
+            return self._simulate_interpolated_vectorized(initial_speed, time_limit, distance_limit, speed_limit)
+
+        last_index = len(self.times) - 1
+        find_indices = self.find_indices
+
+        def limit_indices(column, limit, offset):
+            if limit is None:
+                return np.full(initial_speed.shape, last_index), np.zeros(initial_speed.shape, dtype=bool)
+            limit = np.broadcast_to(np.asarray(limit, dtype=np.float64), initial_speed.shape)
+            is_set = limit > 0
+            return np.where(is_set, find_indices(column, offset + limit), last_index), is_set
+
+        starting_index = find_indices(self.speeds, initial_speed)
+
+        initial_time = self.times[starting_index]
+        initial_distance = self.distances[starting_index]
+
+        time_limit_index, time_set = limit_indices(self.times, time_limit, initial_time)
+        distance_limit_index, distance_set = limit_indices(self.distances, distance_limit, initial_distance)
+        speed_limit_index, speed_set = limit_indices(self.speeds, speed_limit, 0.0)
+
+        # use the soonest reached limit
+        final_index = np.maximum(np.minimum(np.minimum(time_limit_index, distance_limit_index), speed_limit_index), starting_index)
+
         return self.LookupResult(
             speed_reached=self.speeds[final_index],
             time_passed=self.times[final_index] - initial_time,
             distance_traveled=self.distances[final_index] - initial_distance,
-            distance_limit_reached=distance_limit and final_index == distance_limit_index < last_index,
-            speed_limit_reached=speed_limit and final_index == speed_limit_index < last_index,
-            time_limit_reached=time_limit and final_index == time_limit_index < last_index
+            distance_limit_reached=distance_set & (final_index == distance_limit_index) & (distance_limit_index < last_index),
+            speed_limit_reached=speed_set & (final_index == speed_limit_index) & (speed_limit_index < last_index),
+            time_limit_reached=time_set & (final_index == time_limit_index) & (time_limit_index < last_index)
         )
 
 
-BOOST = AccelerationLUT('acceleration/boost.csv')
-THROTTLE = AccelerationLUT('acceleration/throttle.csv')
+    def _simulate_interpolated_vectorized(self, initial_speed, time_limit, distance_limit, speed_limit) -> LookupResult:
+        last_time = self.times[-1]
+        lerp = self.lerp_vectorized
+
+        initial_time = lerp(self.speeds, self.times, initial_speed)
+        initial_distance = lerp(self.times, self.distances, initial_time)
+
+        def limit_times(limit, to_time):
+            if limit is None:
+                return np.full(initial_speed.shape, last_time), np.zeros(initial_speed.shape, dtype=bool)
+            limit = np.broadcast_to(np.asarray(limit, dtype=np.float64), initial_speed.shape)
+            is_set = limit > 0
+            return np.where(is_set, np.minimum(to_time(limit), last_time), last_time), is_set
+
+        time_limit_time, time_set = limit_times(time_limit, lambda limit: initial_time + limit)
+        distance_limit_time, distance_set = limit_times(
+            distance_limit, lambda limit: lerp(self.distances, self.times, initial_distance + limit))
+        speed_limit_time, speed_set = limit_times(speed_limit, lambda limit: lerp(self.speeds, self.times, limit))
+
+        # use the soonest reached limit
+        final_time = np.maximum(np.minimum(np.minimum(time_limit_time, distance_limit_time), speed_limit_time), initial_time)
+
+        return self.LookupResult(
+            speed_reached=lerp(self.times, self.speeds, final_time),
+            time_passed=final_time - initial_time,
+            distance_traveled=lerp(self.times, self.distances, final_time) - initial_distance,
+            distance_limit_reached=distance_set & (final_time == distance_limit_time) & (distance_limit_time < last_time),
+            speed_limit_reached=speed_set & (final_time == speed_limit_time) & (speed_limit_time < last_time),
+            time_limit_reached=time_set & (final_time == time_limit_time) & (time_limit_time < last_time)
+        )
+
+
+BOOST = AccelerationLUT('acceleration/boost.csv', interpolate=True)
+THROTTLE = AccelerationLUT('acceleration/throttle.csv', interpolate=True)
+
+# Tables resampled at 1/1200 s from the analytic drive_1d solutions (see generate_dense_tables.py), interpolated
+BOOST_DENSE = AccelerationLUT('acceleration/boost_dense.csv', interpolate=True)
+THROTTLE_DENSE = AccelerationLUT('acceleration/throttle_dense.csv', interpolate=True)
+
+
+def main():
+    """
+    Accuracy / latency comparison of the ways we have to answer "how long to drive this far":
+    the recorded LUT, the same LUT interpolated, the dense analytic table and the numba analytic solver.
+
+    Accuracy is measured on held-out data: the LUTs are built from the even rows of the recorded tables
+    and queried with pairs of odd rows (start speed -> distance to the later row), so the errors are
+    somewhat pessimistic for the full tables (twice the row spacing).
+    """
+    from timeit import timeit
+    from util.physics.drive_1d_distance import state_at_distance, state_at_distance_vectorized
+
+    rng = np.random.default_rng(0)
+    n_queries = 2000
+    fps = 120
+
+    for name, recorded, dense, boost_amount in (('boost', BOOST, BOOST_DENSE, 100.0),
+                                                ('throttle', THROTTLE, THROTTLE_DENSE, 0.0)):
+        even = slice(0, None, 2)
+        lut = AccelerationLUT.from_columns(recorded.distances[even], recorded.times[even], recorded.speeds[even])
+        interpolated = AccelerationLUT.from_columns(recorded.distances[even], recorded.times[even],
+                                                    recorded.speeds[even], interpolate=True)
+
+        odd = np.arange(1, len(recorded.times), 2)
+        start, end = np.sort(rng.choice(odd, (2, n_queries)), axis=0)
+        keep = end > start
+        start, end = start[keep], end[keep]
+
+        speeds = recorded.speeds[start]
+        distances = recorded.distances[end] - recorded.distances[start]
+        truth = recorded.times[end] - recorded.times[start]
+        boost = np.full_like(speeds, boost_amount)
+
+        # Like estimate_time: past the end of the table keep going at the last speed reached
+        def arrival_time(table, v, d):
+            result = table.simulate_until_limit(v, distance_limit=d)
+            if result.distance_limit_reached: return result.time_passed
+            return result.time_passed + (d - result.distance_traveled) / max(result.speed_reached, 1e-9)
+
+        def arrival_times(table):
+            result = table.simulate_until_limit_vectorized(speeds, distance_limit=distances)
+            leftover = np.where(result.distance_limit_reached, 0.0, distances - result.distance_traveled)
+            return result.time_passed + leftover / np.maximum(result.speed_reached, 1e-9)
+
+        def lut_methods(table):
+            return lambda v, d: arrival_time(table, v, d), lambda: arrival_times(table)
+
+        methods = {
+            'lut': lut_methods(lut),
+            'interpolated lut': lut_methods(interpolated),
+            'dense analytic lut': lut_methods(dense),
+            'numba analytic': (lambda v, d: state_at_distance(d, v, boost_amount)[0],
+                               lambda: state_at_distance_vectorized(distances, speeds, boost)[0]),
+        }
+
+        print(f"\n{name}: {len(truth)} held-out queries")
+        print(f"{'method':>20} {'mean err ms':>12} {'max err ms':>12} {'scalar us':>10} {'batch us':>10}")
+        for method, (scalar, batch) in methods.items():
+            errors = np.abs(batch() - truth) * 1000
+            assert np.allclose([scalar(v, d) for v, d in zip(speeds[:50], distances[:50])], batch()[:50])
+
+            n_times = 20
+            scalar_time = timeit(lambda: [scalar(v, d) for v, d in zip(speeds, distances)], number=n_times)
+            batch_time = timeit(batch, number=n_times)
+            scalar_us = scalar_time / n_times / len(truth) * 1e6
+            batch_us = batch_time / n_times / len(truth) * 1e6
+
+            print(f"{method:>20} {errors.mean():12.3f} {errors.max():12.3f} {scalar_us:10.3f} {batch_us:10.3f}")
+
+        batch_time = timeit(methods['interpolated lut'][1], number=100)
+        print(f"A batch of {len(truth)} interpolated queries is {batch_time * fps:.3f} % of our time budget.")
+
+
+if __name__ == "__main__":
+    main()
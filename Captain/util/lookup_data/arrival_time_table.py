@@ -0,0 +1,186 @@
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+
+class ArrivalTimeTable:
+    """
+    Time to drive a distance in a straight line, for a grid of (distance, initial forward speed, boost amount),
+    precomputed offline with the numba state_at_distance solver and queried with trilinear interpolation.
+
+    The distance axis is evenly spaced in sqrt(distance), so short distances (where the time changes the most)
+    get the most rows, and the index of a query is still computed directly instead of searched for.
+    Past the last row the time is extrapolated with the slope of the last two rows (i.e. at the speed reached).
+
+    When driving backwards the time jumps at distance 0: the car is already there, but any distance ahead means
+    stopping and coming back. So the first row holds the times just past 0 (MIN_DISTANCE), and queries at or
+    behind 0 take no time.
+    """
+
+    MIN_DISTANCE = 1e-3
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        data = np.load(Path(__file__).absolute().parent / file_name)
+
+        self.times = np.ascontiguousarray(data['times'], dtype=np.float32)
+        self.max_distance = float(data['max_distance'])
+        self.min_speed = float(data['min_speed'])
+        self.speed_step = float(data['speed_step'])
+        self.boost_step = float(data['boost_step'])
+
+        self.shape = self.times.shape
+        self.root_step = self.max_distance ** 0.5 / (self.shape[0] - 1)
+        self.last_step = self.max_distance - ((self.shape[0] - 2) * self.root_step) ** 2
+
+        # Flat copies for the queries, which index them 8 times each
+        self._flat_array = self.times.ravel()
+        self._flat = array('f', self.times.tobytes())
+
+    @staticmethod
+    def generate(max_distance=14400.0, distance_rows=81, min_speed=-2300.0, max_speed=2300.0, speed_step=25.0,
+                 max_boost=100.0, boost_step=1.0) -> dict:
+        # Needs numba, only used offline to build the table file
+        from util.physics import drive_1d
+
+        distances = np.linspace(0, max_distance ** 0.5, distance_rows) ** 2
+        distances[0] = ArrivalTimeTable.MIN_DISTANCE
+        speeds = np.arange(min_speed, max_speed + speed_step / 2, speed_step)
+        boosts = np.arange(0, max_boost + boost_step / 2, boost_step)
+
+        distance, speed, boost = np.meshgrid(distances, speeds, boosts, indexing='ij')
+        times = drive_1d.batch("distance", distance, speed, boost)[drive_1d.TIME]
+
+        return dict(times=times.reshape(distance.shape).astype(np.float32), max_distance=max_distance,
+                    min_speed=min_speed, speed_step=speed_step, boost_step=boost_step)
+
+    def time(self, distance: float, speed: float, boost: float) -> float:
+        """Time to drive distance starting at speed with boost amount of boost"""
+        if distance <= 0:
+            return 0.0
+        n_distance, n_speed, n_boost = self.shape
+
+        extra_distance = 0.0
+        if distance >= self.max_distance:
+            extra_distance = distance - self.max_distance
+            i, fi = n_distance - 2, 1.0
+        else:
+            fi = distance ** 0.5 / self.root_step
+            i = min(int(fi), n_distance - 2)
+            fi -= i
+
+        fj = (speed - self.min_speed) / self.speed_step
+        fj = 0.0 if fj < 0 else n_speed - 1.0 if fj > n_speed - 1 else fj
+        j = min(int(fj), n_speed - 2)
+        fj -= j
+
+        fk = boost / self.boost_step
+        fk = 0.0 if fk < 0 else n_boost - 1.0 if fk > n_boost - 1 else fk
+        k = min(int(fk), n_boost - 2)
+        fk -= k
+
+        # bilinear interpolation over (speed, boost) of the two distance rows around the query
+        grid = self._flat
+        a = (i * n_speed + j) * n_boost + k
+        b = a + n_boost
+        low = grid[a] + (grid[a + 1] - grid[a]) * fk
+        high = grid[b] + (grid[b + 1] - grid[b]) * fk
+        near = low + (high - low) * fj
+
+        a += n_speed * n_boost
+        b += n_speed * n_boost
+        low = grid[a] + (grid[a + 1] - grid[a]) * fk
+        high = grid[b] + (grid[b + 1] - grid[b]) * fk
+        far = low + (high - low) * fj
+
+        time = near + (far - near) * fi
+        if extra_distance > 0:
+            time += extra_distance * (far - near) / self.last_step
+        return time
+
+    def time_vectorized(self, distance, speed, boost) -> np.ndarray:
+        """Same as time, but every argument can be an array (or a scalar that gets broadcast)"""
+        distance, speed, boost = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (distance, speed, boost)))
+        n_distance, n_speed, n_boost = self.shape
+
+        beyond = distance >= self.max_distance
+        extra_distance = np.where(beyond, distance - self.max_distance, 0.0)
+
+        fi = np.sqrt(np.clip(distance, 0, self.max_distance)) / self.root_step
+        i = np.minimum(fi.astype(np.intp), n_distance - 2)
+        fi -= i
+
+        fj = np.clip((speed - self.min_speed) / self.speed_step, 0, n_speed - 1)
+        j = np.minimum(fj.astype(np.intp), n_speed - 2)
+        fj -= j
+
+        fk = np.clip(boost / self.boost_step, 0, n_boost - 1)
+        k = np.minimum(fk.astype(np.intp), n_boost - 2)
+        fk -= k
+
+        grid = self._flat_array
+        a = (i * n_speed + j) * n_boost + k
+        b = a + n_boost
+
+        def bilinear(a, b):
+            low = grid[a] + (grid[a + 1] - grid[a]) * fk
+            high = grid[b] + (grid[b + 1] - grid[b]) * fk
+            return low + (high - low) * fj
+
+        row = n_speed * n_boost
+        near, far = bilinear(a, b), bilinear(a + row, b + row)
+        time = near + (far - near) * fi + extra_distance * (far - near) / self.last_step
+        return np.where(distance > 0, time, 0.0)
+
+
+FILE_NAME = 'arrival_time/arrival_time.npz'
+_arrival_times = None
+
+
+def arrival_times() -> ArrivalTimeTable:
+    """The table in FILE_NAME, loaded on the first call (only the TABLE intercept backend needs it)"""
+    global _arrival_times
+    if _arrival_times is None:
+        _arrival_times = ArrivalTimeTable(FILE_NAME)
+    return _arrival_times
+
+
+def main(generate=False):
+    """
+    Check the accuracy of the table against the solver and time the queries (see benchmarks).
+    With generate=True (--generate on the command line) the table file is rebuilt first.
+    """
+    from benchmarks import run
+    from util.physics.drive_1d_distance import state_at_distance_vectorized
+
+    path = Path(__file__).absolute().parent / FILE_NAME
+    if generate:
+        np.savez_compressed(path, **ArrivalTimeTable.generate())
+    table = ArrivalTimeTable(FILE_NAME)
+    print(f"{table.shape} table in {path.name} ({path.stat().st_size // 1024} KiB)")
+
+    rng = np.random.default_rng(0)
+    n = 100000
+    distance = rng.uniform(0, 16000, n)
+    speed = rng.uniform(-2300, 2300, n)
+    boost = rng.integers(0, 101, n).astype(np.float64)
+
+    # Uniform queries, then the short distances where the backwards times jump
+    for name, distance in (("", distance), (" (under 100 uu)", rng.uniform(0, 100, n))):
+        truth = state_at_distance_vectorized(distance, speed, boost)[0]
+        errors = np.abs(table.time_vectorized(distance, speed, boost) - truth) * 1000
+        worst = np.argmax(errors)
+        print(f"Error{name}: mean {errors.mean():.3f} ms, 99th percentile {np.percentile(errors, 99):.3f} ms, "
+              f"max {errors.max():.3f} ms at distance {distance[worst]:.1f}, speed {speed[worst]:.0f}, "
+              f"boost {boost[worst]:.0f}")
+
+    scalar = [table.time(d, v, b) for d, v, b in zip(distance[:1000], speed[:1000], boost[:1000])]
+    assert np.allclose(scalar, table.time_vectorized(distance[:1000], speed[:1000], boost[:1000]), atol=1e-5)
+
+    run(["arrival_time_table."])
+
+
+if __name__ == "__main__":
+    import sys
+    main(generate="--generate" in sys.argv)
@@ -0,0 +1,44 @@
+"""
+Generates the dense acceleration tables (acceleration/*_dense.csv) by sampling the analytic drive_1d solutions,
+which makes them usable with AccelerationLUT without numba at runtime.
+
+Run from the Captain folder: python -m util.lookup_data.generate_dense_tables
+"""
+import csv
+from pathlib import Path
+
+import numpy as np
+
+from util.physics import drive_1d
+
+DT = 1 / 1200
+
+# (file name, boost amount, duration of the recorded table it replaces)
+TABLES = [
+    ('acceleration/boost_dense.csv', 100.0, 1.7),
+    ('acceleration/throttle_dense.csv', 0.0, 2.55),
+]
+
+
+def generate(boost_amount: float, duration: float):
+    times = np.arange(0.0, duration + DT / 2, DT)
+    states = drive_1d.batch("time", times, 0.0, boost_amount)
+    return times, states[drive_1d.DISTANCE], states[drive_1d.VELOCITY]
+
+
+def main():
+    data_folder = Path(__file__).absolute().parent
+
+    for file_name, boost_amount, duration in TABLES:
+        times, distances, speeds = generate(boost_amount, duration)
+
+        with open(data_folder / file_name, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['time', 'car_loc_x', 'car_vel_x'])
+            writer.writerows(zip(times.round(6), distances.round(4), speeds.round(4)))
+
+        print(f"Wrote {len(times)} rows to {file_name}")
+
+
+if __name__ == "__main__":
+    main()
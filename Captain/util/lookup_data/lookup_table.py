@@ -1,27 +1,81 @@
 import csv
+import os
+import tempfile
 from bisect import bisect_left
 from pathlib import Path
 from typing import List
 
+import numpy as np
+
 
 class LookupTable:
+    """
+    Table of floats read from a CSV file in the lookup_data folder.
+
+    The CSV is only parsed the first time: it gets converted into a binary .npy cache next to it (a structured array
+    with one field per column), which later starts memory-map instead of parsing the text again.
+    Several bots start at once, so the cache is written to a temporary file and moved into place, and a cache that
+    can't be read is ignored.
+    """
 
     def __init__(self, file_name: str):
         self.file_name = file_name
+        self.table = self.load()
+
+    @property
+    def csv_path(self) -> Path:
+        return Path(__file__).absolute().parent / self.file_name
+
+    @property
+    def cache_path(self) -> Path:
+        return self.csv_path.with_suffix('.npy')
 
     def get_reader(self) -> csv.DictReader:
-        data_folder = Path(__file__).absolute().parent
-        file = open(data_folder / self.file_name)
+        file = open(self.csv_path)
         return csv.DictReader(file)
 
-    def get_column(self, name: str) -> List[float]:
+    def load(self) -> np.ndarray:
+        cache = self.cache_path
+        if cache.exists() and cache.stat().st_mtime >= self.csv_path.stat().st_mtime:
+            try:
+                return np.load(cache, mmap_mode='r')
+            except (ValueError, OSError, EOFError):
+                pass # Corrupt cache, parse the CSV and write it again
+
+        table = self.parse()
+        try:
+            descriptor, temporary = tempfile.mkstemp(dir=cache.parent, suffix='.npy.tmp')
+            try:
+                with os.fdopen(descriptor, 'wb') as file:
+                    np.save(file, table)
+                os.replace(temporary, cache)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except OSError:
+            pass # Read-only install, just parse again next time
+        return table
+
+    def parse(self) -> np.ndarray:
+        # Parse the whole CSV into a structured array with a float64 field per column
+        reader = self.get_reader()
+        rows = [tuple(float(value) for value in row.values()) for row in reader]
+        dtype = [(name, np.float64) for name in reader.fieldnames]
+        return np.array(rows, dtype=dtype)
+
+    def get_column(self, name: str) -> np.ndarray:
         """
         Get all data in a column
         :param name: Name of the column
-        :return: List of float values in the column
+        :return: Contiguous array of float values in the column
         """
-        return [float(row[name]) for row in self.get_reader()]
+        return np.array(self.table[name], dtype=np.float64)
 
     @staticmethod
     def find_index(column: List[float], value: float) -> int:
         return bisect_left(column, value, hi=len(column) - 1)
+
+    @staticmethod
+    def find_indices(column: np.ndarray, values) -> np.ndarray:
+        # Vectorized find_index
+        return np.minimum(np.searchsorted(column, values), len(column) - 1)
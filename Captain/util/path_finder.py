@@ -4,7 +4,7 @@ from collections import namedtuple
 from numba import njit, from_dtype, f8, i8
 from numba.types import Tuple, List, NamedTuple
 
-from skeleton.util.structure.dtypes import dtype_full_boost
+from util.dtypes import dtype_full_boost
 from util.physics.drive_1d_heuristic import state_at_distance_heuristic, state_at_distance_heuristic_vectorized
 
 import numpy as np
@@ -148,44 +148,10 @@ def optional_boost_target(boost_pads: np.ndarray, start: np.ndarray, target: np.
 
 
 def main():
-    """Testing for errors and performance"""
+    """Time the functions of this module (see benchmarks)"""
+    from benchmarks import run
 
-    from timeit import timeit
-    from skeleton.test.skeleton_agent_test import SkeletonAgentTest
-
-    agent = SkeletonAgentTest()
-    agent.initialize_agent()
-
-    boost_pads = agent.game_data.boost_pads[:5]
-
-    boost_pads["timer"] = 0
-
-    def test_function():
-        boost_pads["location"] = np.random.rand(*boost_pads["location"].shape)
-        boost_pads["is_active"] = np.random.rand(*boost_pads["is_active"].shape) > 0.5
-        boost_pads["is_full_boost"] = np.random.rand(*boost_pads["is_full_boost"].shape) > 0.5
-
-        my_loc = boost_pads["location"][3]
-        target_loc = boost_pads["location"][4]
-        vel = np.random.rand(3) / 1000
-        target_dir = np.array([0, 1.0, 0])
-        print(boost_pads, my_loc, target_loc, vel, target_dir)
-        return find_fastest_path(boost_pads, my_loc, target_loc, vel, 50.0, target_dir)
-
-    print(test_function())
-
-    # def test_function():
-    #     return optional_boost_target(boost_pads, my_loc, target_loc, vel, 50)
-    #
-    # print(test_function())
-
-    fps = 120
-    n_times = 100000
-    time_taken = timeit(test_function, number=n_times)
-    percentage = round(time_taken * fps / n_times * 100, 5)
-
-    print(f"Took {time_taken} seconds to run {n_times} times.")
-    print(f"That's {percentage} % of our time budget.")
+    run(["path_finder."])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+from math import acos, sqrt
+
+from numba import jit, f8, guvectorize
+
+from util.physics.drive_1d_distance import state_at_distance
+
+# Layout of the per car rows taken by the kernels (see util.intercept.car_rows)
+CAR_POSITION = slice(0, 3)
+CAR_FORWARD = slice(3, 6) # already multiplied by the driving direction
+CAR_SPEED = 6 # forward speed
+CAR_BOOST = 7 # 0 when driving backwards
+CAR_TURNING_RADIUS = 8
+CAR_ROW_SIZE = 9
+
+
+@jit(f8(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8), nopython=True, fastmath=True, cache=True)
+def estimate_time(x, y, z, forward_x, forward_y, forward_z, speed, boost, turning_radius,
+                  target_x, target_y, target_z) -> float:
+    """
+    Estimated time for the car to reach the target, like util.intercept.estimate_time,
+    with the turning estimate and the boost and throttle phases (state_at_distance) fused in one kernel.
+    """
+    dx, dy, dz = target_x - x, target_y - y, target_z - z
+
+    target_distance = max(sqrt(dx * dx + dy * dy + dz * dz), 1e-9)
+    forward_length = max(sqrt(forward_x * forward_x + forward_y * forward_y + forward_z * forward_z), 1e-9)
+    cos_angle = (dx * forward_x + dy * forward_y + dz * forward_z) / (target_distance * forward_length)
+    turning = acos(min(max(cos_angle, -1.0), 1.0)) * turning_radius / 1800
+    if turning < 0.5: turning = 0.0
+
+    dist = sqrt(dx * dx + dy * dy) - 200
+    if dist < 0: return turning
+
+    return state_at_distance(dist, speed, boost)[0] * 1.05 + turning
+
+
+@guvectorize(["(f8[:], f8[:, :], f8[:])"], "(k), (n, d) -> (n)", nopython=True)
+def estimate_times_vectorized(car, targets, out_time) -> None:
+    """Estimated times (time[]) for the car (a row of CAR_ROW_SIZE values) to reach every target (an n x 3 array).
+    Broadcasts over cars when given a (cars x CAR_ROW_SIZE) array."""
+    for i in range(targets.shape[0]):
+        out_time[i] = estimate_time(car[0], car[1], car[2], car[3], car[4], car[5], car[6], car[7], car[8],
+                                    targets[i, 0], targets[i, 1], targets[i, 2])
+
+
+def main():
+    """Time the functions of this module (see benchmarks)"""
+    from benchmarks import run
+
+    run(["arrival_time."])
+
+
+if __name__ == "__main__":
+    main()
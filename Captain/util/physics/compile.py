@@ -1,12 +1,25 @@
-import setuptools
+"""
+Ahead-of-time build of the numba kernels we use at runtime into a single extension module (util/physics/drive_1d_aot),
+so a bot start doesn't have to JIT compile (or load from the cache) every kernel. util.physics.kernels imports it
+when it exists and falls back to the JIT versions otherwise.
+
+Build from the Captain folder: python -m util.physics.compile
+"""
+import setuptools  # numba.pycc needs it to build the extension
+from pathlib import Path
+
 from numba.pycc import CC
 
 from numba import jit, typeof
 import numpy as np
 
+from util.physics.arrival_time import estimate_time
 from util.physics.drive_1d_distance import state_at_distance
 from util.physics.drive_1d_time import state_at_time
 from util.physics.drive_1d_velocity import state_at_velocity
+from util.special_lambertw import lambertw
+
+MODULE_NAME = "drive_1d_aot"
 
 
 def state_vectorize(function):
@@ -19,27 +32,49 @@ def state_vectorize(function):
     return jit(nopython=True, fastmath=True)(vectorized_function)
 
 
+def estimate_times_loop(cars, targets):
+    # AOT version of arrival_time.estimate_times_vectorized, for a (cars x CAR_ROW_SIZE) array of car rows
+    output = np.empty((cars.shape[0], targets.shape[0]), dtype=np.float64)
+    for c in range(cars.shape[0]):
+        car = cars[c]
+        for i in range(targets.shape[0]):
+            output[c, i] = estimate_time(car[0], car[1], car[2], car[3], car[4], car[5], car[6], car[7], car[8],
+                                         targets[i, 0], targets[i, 1], targets[i, 2])
+    return output
+
+
 out_type = typeof(np.empty((3, 9), dtype=np.float64))
 arg_type = typeof(np.empty((9,), dtype=np.float64))
+matrix_type = typeof(np.empty((9, 9), dtype=np.float64))
 
+# (name, signature, function) of everything exported by the module
+EXPORTS = [
+    ("state_at_distance", "UniTuple(f8, 3)(f8, f8, f8)", state_at_distance),
+    ("state_at_distance_vectorized", out_type(arg_type, arg_type, arg_type), state_vectorize(state_at_distance)),
+    ("state_at_time", "UniTuple(f8, 3)(f8, f8, f8)", state_at_time),
+    ("state_at_time_vectorized", out_type(arg_type, arg_type, arg_type), state_vectorize(state_at_time)),
+    ("state_at_velocity", "UniTuple(f8, 3)(f8, f8, f8)", state_at_velocity),
+    ("state_at_velocity_vectorized", out_type(arg_type, arg_type, arg_type), state_vectorize(state_at_velocity)),
+    ("lambertw", "f8(f8)", lambertw),
+    ("estimate_time", "f8(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)", estimate_time),
+    ("estimate_times_vectorized", matrix_type(matrix_type, matrix_type),
+     jit(nopython=True, fastmath=True)(estimate_times_loop)),
+]
 
-if __name__ == "__main__":
-    cc = CC("drive_1d_distance")
 
-    cc.export("state_at_distance", "UniTuple(f8, 3)(f8, f8, f8)")(state_at_distance)
-    cc.export("state_at_distance_vectorized", out_type(arg_type, arg_type, arg_type))(
-        state_vectorize(state_at_distance)
-    )
-    cc.compile()
+def build(output_dir=None):
+    cc = CC(MODULE_NAME)
+    cc.output_dir = str(output_dir or Path(__file__).absolute().parent)
+    cc.verbose = False
 
-    cc = CC("drive_1d_time")
-    cc.export("state_at_time", "UniTuple(f8, 3)(f8, f8, f8)")(state_at_time)
-    cc.export("state_at_time_vectorized", out_type(arg_type, arg_type, arg_type))(state_vectorize(state_at_time))
+    for name, signature, function in EXPORTS:
+        cc.export(name, signature)(function)
     cc.compile()
 
-    cc = CC("drive_1d_velocity")
-    cc.export("state_at_velocity", "UniTuple(f8, 3)(f8, f8, f8)")(state_at_velocity)
-    cc.export("state_at_velocity_vectorized", out_type(arg_type, arg_type, arg_type))(
-        state_vectorize(state_at_velocity)
-    )
-    cc.compile()
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    start = perf_counter()
+    build()
+    print(f"Built {MODULE_NAME} with {len(EXPORTS)} kernels in {perf_counter() - start:.1f} seconds.")
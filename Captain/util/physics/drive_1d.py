@@ -0,0 +1,106 @@
+"""
+One batched API over the drive_1d solvers. Every kind fills the same four rows of a (4, n) output array,
+out[TIME], out[DISTANCE], out[VELOCITY] and out[BOOST], whatever order the underlying solver returns them in.
+
+    out = np.empty((4, n))
+    drive_1d.batch("distance", distances, initial_velocities, boost_amounts, out=out)
+    times = out[TIME]
+
+Batches of PARALLEL_THRESHOLD or more elements are split across threads (numba prange), which is what
+generating reachability tables and training data needs. Kernels are only compiled the first time they are used.
+"""
+import importlib
+
+import numpy as np
+from numba import njit, prange
+
+TIME, DISTANCE, VELOCITY, BOOST = range(4)
+
+PARALLEL_THRESHOLD = 10000
+
+# kind -> (module, solver, output row of each of the solver's 3 return values, row of the input x)
+KINDS = {
+    "distance": ("util.physics.drive_1d_distance", "state_at_distance", (TIME, VELOCITY, BOOST), DISTANCE),
+    "time": ("util.physics.drive_1d_time", "state_at_time", (DISTANCE, VELOCITY, BOOST), TIME),
+    "velocity": ("util.physics.drive_1d_velocity", "state_at_velocity", (TIME, DISTANCE, BOOST), VELOCITY),
+    "distance_simulation": ("util.physics.drive_1d_simulation", "state_at_distance_simulation",
+                            (TIME, VELOCITY, BOOST), DISTANCE),
+    "time_simulation": ("util.physics.drive_1d_simulation", "state_at_time_simulation",
+                        (DISTANCE, VELOCITY, BOOST), TIME),
+    "velocity_simulation": ("util.physics.drive_1d_simulation", "state_at_velocity_simulation",
+                            (TIME, DISTANCE, BOOST), VELOCITY),
+}
+
+_kernels = {}
+
+
+def _make_kernel(solver, rows, x_row, parallel):
+    row_0, row_1, row_2 = rows
+
+    def kernel(x, v0, boost, out):
+        for i in prange(x.shape[0]):
+            value_0, value_1, value_2 = solver(x[i], v0[i], boost[i])
+            out[row_0, i] = value_0
+            out[row_1, i] = value_1
+            out[row_2, i] = value_2
+            out[x_row, i] = x[i]
+
+    return njit(kernel, parallel=parallel, fastmath=True, cache=True)
+
+
+def _kernel(kind, parallel):
+    key = kind, parallel
+    if key not in _kernels:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown drive_1d kind {kind!r}, expected one of {', '.join(KINDS)}")
+        module, solver, rows, x_row = KINDS[kind]
+        _kernels[key] = _make_kernel(getattr(importlib.import_module(module), solver), rows, x_row, parallel)
+    return _kernels[key]
+
+
+def batch(kind: str, x, v0, boost, out: np.ndarray = None, parallel: bool = None) -> np.ndarray:
+    """
+    Solve kind ("distance", "time", "velocity" or their "_simulation" versions) for every element of x,
+    starting at velocity v0 with boost amount of boost (arrays or scalars, broadcast together and flattened).
+    Writes into out, a preallocated float64 (4, n) C-contiguous array, if given, and returns it.
+    parallel defaults to splitting batches of PARALLEL_THRESHOLD elements or more across threads.
+    """
+    x, v0, boost = (np.ascontiguousarray(array, dtype=np.float64).ravel()
+                    for array in np.broadcast_arrays(x, v0, boost))
+    n = x.shape[0]
+
+    if out is None:
+        out = np.empty((4, n))
+    elif out.shape != (4, n) or out.dtype != np.float64 or not out.flags.c_contiguous:
+        raise ValueError(f"out must be a C-contiguous float64 array of shape (4, {n}), got {out.dtype} {out.shape}")
+
+    if parallel is None:
+        parallel = n >= PARALLEL_THRESHOLD
+
+    _kernel(kind, parallel)(x, v0, boost, out)
+    return out
+
+
+def main():
+
+    from benchmarks import run
+    from util.physics.drive_1d_distance import state_at_distance_vectorized
+
+    rng = np.random.default_rng(0)
+
+    for n in (360, 100000):
+        x = rng.uniform(0, 6000, n)
+        v0 = rng.uniform(-2300, 2300, n)
+        boost = rng.uniform(0, 100, n)
+        out = np.empty((4, n))
+
+        expected = state_at_distance_vectorized(x, v0, boost)
+        for parallel in (False, True):
+            batch("distance", x, v0, boost, out=out, parallel=parallel)
+            assert np.allclose(out[[TIME, VELOCITY, BOOST]], expected) and np.array_equal(out[DISTANCE], x)
+
+    run(["drive_1d.", "drive_1d_distance.state_at_distance_vectorized"])
+
+
+if __name__ == "__main__":
+    main()
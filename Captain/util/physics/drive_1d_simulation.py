@@ -100,30 +100,10 @@ def state_at_velocity_simulation_vectorized(
 
 
 def main():
+    """Time the functions of this module (see benchmarks)"""
+    from benchmarks import run
 
-    from timeit import timeit
-
-    import numpy as np
-
-    time = np.linspace(0, 6, 360)
-    desired_distance = np.linspace(0, 6000, 360)
-    initial_velocity = np.linspace(-2300, 2300, 360)
-    boost_amount = np.linspace(0, 100, 360)
-
-    desired_velocity = -initial_velocity
-
-    def test_function():
-        return state_at_velocity_simulation_vectorized(desired_velocity, initial_velocity, boost_amount)
-
-    print(test_function())
-
-    fps = 120
-    n_times = 1000
-    time_taken = timeit(test_function, number=n_times)
-    percentage = time_taken * fps / n_times * 100
-
-    print(f"Took {time_taken} seconds to run {n_times} times.")
-    print(f"That's {percentage:.5f} % of our time budget.")
+    run(["drive_1d_simulation."])
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@ import math
 from collections import namedtuple
 from numba import jit, f8
 
-from util.special_lambertw import lambertw
+from util.special_lambertw import lambertw_real as lambertw
 
 
 THROTTLE_ACCELERATION_0 = 1600.0
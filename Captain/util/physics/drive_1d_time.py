@@ -100,26 +100,10 @@ def state_at_time_vectorized(time, initial_velocity, boost_amount, out_dist, out
 
 
 def main():
+    """Time the functions of this module (see benchmarks)"""
+    from benchmarks import run
 
-    from timeit import timeit
-    import numpy as np
-
-    time = np.linspace(0, 6, 360)
-    initial_velocity = np.linspace(-2300, 2300, 360)
-    boost_amount = np.linspace(0, 100, 360)
-
-    def test_function():
-        return state_at_time_vectorized(time, initial_velocity, boost_amount)[0]
-
-    print(test_function())
-
-    fps = 120
-    n_times = 10000
-    time_taken = timeit(test_function, number=n_times)
-    percentage = time_taken * fps / n_times * 100
-
-    print(f"Took {time_taken} seconds to run {n_times} times.")
-    print(f"That's {percentage:.5f} % of our time budget.")
+    run(["drive_1d_time."])
 
 
 if __name__ == "__main__":
@@ -104,26 +104,10 @@ def state_at_velocity_vectorized(
 
 
 def main():
+    """Time the functions of this module (see benchmarks)"""
+    from benchmarks import run
 
-    from timeit import timeit
-    import numpy as np
-
-    initial_velocity = np.linspace(-2300, 2300, 360)
-    desired_vel = -initial_velocity
-    boost_amount = np.linspace(0, 100, 360)
-
-    def test_function():
-        return state_at_velocity_vectorized(desired_vel, initial_velocity, boost_amount)
-
-    print(test_function())
-
-    fps = 120
-    n_times = 10000
-    time_taken = timeit(test_function, number=n_times)
-    percentage = time_taken * fps / n_times * 100
-
-    print(f"Took {time_taken} seconds to run {n_times} times.")
-    print(f"That's {percentage:.5f} % of our time budget.")
+    run(["drive_1d_velocity."])
 
 
 if __name__ == "__main__":
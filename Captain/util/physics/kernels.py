@@ -0,0 +1,75 @@
+"""
+Import shim for the numba kernels used at runtime: prefers the ahead-of-time compiled drive_1d_aot module
+(built with python -m util.physics.compile) and falls back to the JIT compiled versions when it is missing
+or when CAPTAIN_JIT_ONLY is set in the environment.
+
+The vectorized state_at_* functions return (3, n) arrays with AOT and tuples of 3 arrays with JIT,
+both of which unpack the same way: time, vel, boost = state_at_distance_vectorized(...)
+"""
+import os
+
+AOT = False
+if not os.environ.get("CAPTAIN_JIT_ONLY"):
+    try:
+        from util.physics.drive_1d_aot import (
+            state_at_distance,
+            state_at_distance_vectorized,
+            state_at_time,
+            state_at_time_vectorized,
+            state_at_velocity,
+            state_at_velocity_vectorized,
+            lambertw,
+            estimate_time,
+            estimate_times_vectorized,
+        )
+        AOT = True
+    except ImportError:
+        pass
+
+if not AOT:
+    from util.physics.drive_1d_distance import state_at_distance, state_at_distance_vectorized
+    from util.physics.drive_1d_time import state_at_time, state_at_time_vectorized
+    from util.physics.drive_1d_velocity import state_at_velocity, state_at_velocity_vectorized
+    from util.special_lambertw import lambertw
+    from util.physics.arrival_time import estimate_time, estimate_times_vectorized
+
+
+def main():
+    """Compare the bot start cost (import + first call of every kernel) with and without the AOT module"""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = """
+from time import perf_counter
+start = perf_counter()
+import numpy as np
+import util.physics.kernels as kernels
+imported = perf_counter()
+x = np.full(9, 500.0)
+for function in (kernels.state_at_distance, kernels.state_at_time, kernels.state_at_velocity):
+    function(1000.0, 500.0, 50.0)
+for function in (kernels.state_at_distance_vectorized, kernels.state_at_time_vectorized,
+                 kernels.state_at_velocity_vectorized):
+    function(x, x, x)
+kernels.lambertw(-0.2)
+kernels.estimate_times_vectorized(np.ones((6, 9)), np.ones((9, 3)))
+print(kernels.AOT, imported - start, perf_counter() - imported)
+"""
+    captain_folder = Path(__file__).absolute().parent.parent.parent
+
+    for name, jit_only in (("AOT", ""), ("JIT", "1")):
+        env = dict(os.environ, CAPTAIN_JIT_ONLY=jit_only)
+        output = subprocess.run([sys.executable, "-c", script], cwd=captain_folder, env=env,
+                                capture_output=True, text=True, check=True).stdout.split()
+        aot, import_time, first_call_time = output[0] == "True", float(output[1]), float(output[2])
+
+        if name == "AOT" and not aot:
+            print("No AOT module found, build it with python -m util.physics.compile")
+            continue
+        print(f"{name}: import {import_time:.3f} s, first calls {first_call_time:.3f} s, "
+              f"total {import_time + first_call_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Background warm-up of the numba kernels: the first call of a @jit / @guvectorize function compiles it (or loads it
+from the cache), which must not happen in the middle of a live tick. start() calls every registered kernel once
+on a background thread and sets READY when they are all usable, until then the hot path uses the LUT fallback.
+"""
+import importlib
+import threading
+from time import perf_counter
+
+import numpy as np
+
+READY = threading.Event()
+kernels = None # util.physics.kernels, once warmed up
+timings = {} # kernel name -> seconds its warm-up took (including the import of its module, for the first one)
+errors = {} # kernel name -> exception raised by its warm-up call
+
+# (name, module, function, args) of every kernel to warm up
+KERNELS = []
+
+_thread = None
+_finished = False
+
+
+def register(name, module, function, *args):
+    """Register a kernel to be called with args during warm-up (module is only imported on the warm-up thread)"""
+    KERNELS.append((name, module, function, args))
+
+
+_values = np.linspace(100.0, 1000.0, 9)
+
+register("state_at_distance", "util.physics.kernels", "state_at_distance", 1000.0, 500.0, 50.0)
+register("state_at_distance_vectorized", "util.physics.kernels", "state_at_distance_vectorized", _values, _values, _values)
+register("state_at_time", "util.physics.kernels", "state_at_time", 1.0, 500.0, 50.0)
+register("state_at_time_vectorized", "util.physics.kernels", "state_at_time_vectorized", _values, _values, _values)
+register("state_at_velocity", "util.physics.kernels", "state_at_velocity", 1500.0, 500.0, 50.0)
+register("state_at_velocity_vectorized", "util.physics.kernels", "state_at_velocity_vectorized", _values, _values, _values)
+register("lambertw", "util.physics.kernels", "lambertw", -0.2)
+register("estimate_time", "util.physics.kernels", "estimate_time", *_values[:9], 0.0, 0.0, 0.0)
+register("estimate_times_vectorized", "util.physics.kernels", "estimate_times_vectorized",
+         np.tile(_values, (6, 1)), np.zeros((9, 3)))
+
+
+def start(log=None) -> threading.Thread:
+    """Start the warm-up thread (only once). log gets called with the report when it's done"""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=_warm_up, args=(log,), name="numba warm-up", daemon=True)
+        _thread.start()
+    return _thread
+
+
+def _warm_up(log):
+    global kernels, _finished
+
+    for name, module, function, args in KERNELS:
+        start_time = perf_counter()
+        try:
+            getattr(importlib.import_module(module), function)(*args)
+        except Exception as e:
+            errors[name] = e
+        timings[name] = perf_counter() - start_time
+
+    # The hot path only needs util.physics.kernels, stay on the fallback if any of those failed
+    if not any(module == "util.physics.kernels" and name in errors for name, module, _, _ in KERNELS):
+        kernels = importlib.import_module("util.physics.kernels")
+        READY.set()
+    _finished = True
+
+    if log is not None:
+        log(report())
+
+
+def report() -> str:
+    if not _finished:
+        return "Numba warm-up still running"
+
+    slowest = sorted(timings.items(), key=lambda item: -item[1])
+    details = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in slowest)
+    lines = [f"Numba warm-up done in {sum(timings.values()):.2f} s "
+             f"({'AOT' if kernels and kernels.AOT else 'JIT'}, ready: {READY.is_set()}): {details}"]
+    lines += [f"{name} failed: {error!r}" for name, error in errors.items()]
+    return "\n".join(lines)
+
+
+def main():
+    start(print).join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+Switches shared by the bot's entry points: Captain.py (one car per process) and hivemind.py (a whole team in one).
+"""
+from util import intercept
+
+RENDERING = True
+ESTIMATE_BACKEND = intercept.LUT # Arrival time estimates: intercept.LUT, intercept.TABLE or intercept.ANALYTIC (numba)
+RECORD_PACKETS = False # Save every packet to recordings/ for offline replays (see offline.recorder)
+SPANS = False # Time the hot path (util.spans), the report is logged when the bot retires
+SPANS_SAMPLE_EVERY = 1 # Only time one tick in N, e.g. 10 to leave the spans on in matches
+SPANS_OVERLAY = False # Draw the span times on screen (needs RENDERING)
+DEGRADE_UNDER_PRESSURE = True # Cut expensive work short when a tick runs out of budget (util.deadline)
+SHARE_WORLD = False # The captain publishes its ball prediction and reachability to the marujos (util.shared_world)
+PIPELINED_PLANNING = False # Plan the next action on a background thread, slower ticks under the GIL (policy.planner)
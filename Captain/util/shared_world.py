@@ -0,0 +1,213 @@
+"""
+The captain's world model in shared memory: the captain publishes its ball trajectory, and the reachable rows of
+every car (see util.intercept.ReachabilityMatrix) when its policy already computed them, into a segment per team
+and match. The marujos adopt them (GameInfo.adopt_prediction) instead of simulating the ball and estimating arrival
+times themselves.
+
+Writes follow a seqlock: the captain makes the sequence number odd, writes, then makes it even again. Readers never
+block the captain, they copy the data out while the number is even and only keep the copy if it didn't change
+meanwhile. A torn, stale (older than MAX_AGE, or from before the last touch) or missing publication makes the
+marujo fall back to predicting on its own.
+
+The segment is named after the match (its matchcomms address) and the team, so concurrent matches don't share one.
+The captain owns it: it creates the segment on its first publish, replacing one a crashed run left behind, and
+unlinks it when it retires. The marujos attach once it exists, and attach again when they only get stale
+publications for a while (they may be holding a replaced segment).
+"""
+import os
+import zlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+LAYOUT_VERSION = 2
+MAX_SLICES = 720
+MAX_CARS = 8
+MAX_AGE = 2.5 / 120 # game seconds
+FORESIGHT = 5.0 # seconds of trajectory published, whatever the captain's last predict_ball asked for
+REATTACH_AFTER = 120 # stale reads in a row before a marujo attaches to the segment again
+
+_created = set() # segments this process created, several agents can share a process
+
+HEADER = np.dtype([
+    ("seq", np.uint64),
+    ("version", np.int32),
+    ("count", np.int32), # trajectory slices
+    ("stride", np.int32),
+    ("columns", np.int32), # reachable columns, 0 when the captain had no reachability matrix
+    ("num_cars", np.int32),
+    ("time", np.float64), # game time the captain published at
+    ("touch_time", np.float64), # latest touch the trajectory accounts for
+    ("foresight", np.float64),
+    ("dt", np.float64),
+])
+
+LAYOUT = np.dtype([
+    ("header", HEADER),
+    ("time", np.float64, MAX_SLICES),
+    ("position", np.float64, (MAX_SLICES, 3)),
+    ("velocity", np.float64, (MAX_SLICES, 3)),
+    ("angular_velocity", np.float64, (MAX_SLICES, 3)),
+    ("reachable", np.bool_, (MAX_CARS, MAX_SLICES)),
+])
+
+
+def segment_name(match, team) -> str:
+    # match is anything that identifies the match to every bot in it, e.g. the matchcomms root URL
+    return f"captain_world_{zlib.crc32(str(match).encode()):08x}_{team}"
+
+
+class SharedWorld:
+    def __init__(self, name):
+        # Nothing is opened until the first publish (captain) or read (marujo)
+        self.name = name
+        self.memory = None
+        self.world = self.header = None
+        self.owner = False
+        self._published_key = None
+        self._stale_streak = 0
+
+        self.published = 0
+        self.adopted = 0
+        self.stale = 0
+        self.torn = 0
+
+    def _create(self):
+        try:
+            memory = shared_memory.SharedMemory(self.name, create=True, size=LAYOUT.itemsize)
+        except FileExistsError:
+            # Left behind by a run of this match that didn't exit cleanly
+            stale = shared_memory.SharedMemory(self.name)
+            stale.close()
+            stale.unlink()
+            memory = shared_memory.SharedMemory(self.name, create=True, size=LAYOUT.itemsize)
+        _created.add(self.name)
+        self._open(memory, owner=True)
+        self.header["seq"] = 0
+        self.header["count"] = 0
+        self.header["version"] = LAYOUT_VERSION
+
+    def _attach(self) -> bool:
+        try:
+            memory = shared_memory.SharedMemory(self.name)
+        except FileNotFoundError:
+            return False # the captain hasn't published yet
+        if os.name == "posix" and self.name not in _created:
+            # Attaching registers the segment with this process' resource tracker too, which would unlink it
+            # when a marujo exits. The tracker keeps one registration per name, so when the owner lives in this
+            # process we'd be dropping its registration instead
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(memory._name, "shared_memory")
+        self._open(memory, owner=False)
+        return True
+
+    def _open(self, memory, owner):
+        self.memory = memory
+        self.owner = owner
+        self.world = np.ndarray((), dtype=LAYOUT, buffer=memory.buf)
+        self.header = self.world["header"]
+
+    def publish(self, info):
+        """Publish info's ball predictions (FORESIGHT seconds of them) and its cached reachability (captain only)"""
+        if self.memory is None or not self.owner:
+            self.close()
+            self._create()
+
+        info.predict_ball(FORESIGHT) # a cache hit unless nothing predicted this far this tick
+        if info.prediction_key == self._published_key:
+            return
+
+        predictions = info.ball_predictions
+        count = min(len(predictions), MAX_SLICES)
+        if count < 2 or info.num_cars > MAX_CARS:
+            return
+
+        # Only share the matrix if the captain's policy needed it anyway, the marujos can compute their own
+        reachability = info.cached_reachability()
+        columns = min(reachability.reachable.shape[1], MAX_SLICES) if reachability is not None else 0
+        header = self.header
+
+        header["seq"] += 1
+        header["count"] = count
+        header["stride"] = reachability.stride if reachability is not None else 1
+        header["columns"] = columns
+        header["num_cars"] = info.num_cars
+        header["time"] = info.time
+        header["touch_time"] = info.latest_touch_time
+        header["foresight"] = predictions.time[count - 1] - info.time
+        header["dt"] = info.prediction_dt
+        self.world["time"][:count] = predictions.time[:count]
+        self.world["position"][:count] = predictions.position[:count]
+        self.world["velocity"][:count] = predictions.velocity[:count]
+        self.world["angular_velocity"][:count] = predictions.angular_velocity[:count]
+        if columns:
+            self.world["reachable"][:info.num_cars, :columns] = reachability.reachable[:, :columns]
+        header["seq"] += 1
+        self._published_key = info.prediction_key
+        self.published += 1
+
+    def read(self, info) -> bool:
+        """Adopt the captain's last publication into info if it is consistent and recent, returns whether it was"""
+        if self.memory is None and not self._attach():
+            return False
+
+        header = self.header
+        seq = int(header["seq"])
+        if seq == 0 or header["version"] != LAYOUT_VERSION:
+            return False
+        if seq % 2:
+            self.torn += 1
+            return False
+
+        count, stride, num_cars = int(header["count"]), int(header["stride"]), int(header["num_cars"])
+        columns = int(header["columns"])
+        time, touch_time = float(header["time"]), float(header["touch_time"])
+        foresight, dt = float(header["foresight"]), float(header["dt"])
+        if (
+            abs(info.time - time) > MAX_AGE
+            or touch_time != info.latest_touch_time
+            or num_cars != info.num_cars
+        ):
+            self._count_stale()
+            return False
+
+        copies = (
+            self.world["time"][:count].copy(),
+            self.world["position"][:count].copy(),
+            self.world["velocity"][:count].copy(),
+            self.world["angular_velocity"][:count].copy(),
+        )
+        reachable = self.world["reachable"][:num_cars, :columns].copy() if columns else None
+
+        if int(header["seq"]) != seq:
+            self.torn += 1
+            return False
+
+        if not info.adopt_prediction(*copies, foresight, dt, reachable, stride):
+            self._count_stale()
+            return False
+        self._stale_streak = 0
+        self.adopted += 1
+        return True
+
+    def _count_stale(self):
+        self.stale += 1
+        self._stale_streak += 1
+        if self._stale_streak >= REATTACH_AFTER:
+            self._stale_streak = 0
+            self.close()
+
+    def close(self):
+        if self.memory is None:
+            return
+        self.world = self.header = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+            _created.discard(self.name)
+        self.memory = None
+        self.owner = False
+
+    def report(self) -> str:
+        return (f"Shared world: {self.published} published, {self.adopted} adopted, "
+                f"{self.stale} stale, {self.torn} torn")
@@ -0,0 +1,213 @@
+"""
+Named spans over the hot path: how many times each one ran and how long it took, tick by tick.
+
+Off by default and free when off: nothing is wrapped until enable() patches the functions in TARGETS (and the ones
+added with register()) in place. With enable(N) only one tick in N is timed and the wrappers pass straight
+through on the others, cheap enough to leave on in a live match.
+
+    spans.register(Captain, "render", "render")
+    spans.enable(10, root=(Captain, "get_output"))
+    ...
+    print(spans.report())
+
+The root span is the whole tick: every time its outermost call returns, the tick's counts and times go into a ring
+buffer of the last RING_SIZE sampled ticks. Times are inclusive, a span nested in another one
+(e.g. predict_ball inside choose_stance) counts towards both.
+
+Only the thread running the root span is timed, work on other threads (e.g. policy.planner) passes straight through
+instead of being charged to the current tick.
+"""
+import json
+import sys
+import threading
+from time import perf_counter
+
+import numpy as np
+
+RING_SIZE = 1200 # sampled ticks kept
+TICK_BUDGET = 1 / 120
+
+# (module, attribute, span name) instrumented by enable(). Play.step also covers every subclass' own step
+TARGETS = [
+    ("util.game_info", "GameInfo.read_packet", "read_packet"),
+    ("util.game_info", "GameInfo.predict_ball", "predict_ball"),
+    ("util.intercept", "Intercept.__init__", "Intercept"),
+    ("util.intercept", "ReachabilityMatrix.__init__", "ReachabilityMatrix"),
+    ("policy.base_policy", "choose_stance", "choose_stance"),
+    ("policy.marujo_strategy", "choose_action", "choose_action"),
+    ("plays.play", "Play.step", "Play.step"),
+]
+
+names = [] # span names, in ring buffer column order
+enabled = False
+sample_every = 1
+
+_extra = [] # (owner, attribute, span name) added with register()
+_patched = [] # (owner, attribute, original) to undo in disable()
+_counts = []
+_times = []
+_depth = [] # nesting of every span, only the outermost call is timed
+_sampling = True
+_thread = None # thread running the root span, None without a root
+_tick = 0
+_ring_counts = None
+_ring_times = None
+_ring_ticks = 0 # sampled ticks written to the ring so far
+
+
+def register(owner, attribute, name):
+    """Instrument owner.attribute (owner is a class, module or module name) as name on enable()"""
+    if (owner, attribute, name) not in _extra:
+        _extra.append((owner, attribute, name))
+
+
+def enable(every=1, root=None):
+    """
+    Wrap every target in an already imported module (only once), timing one tick in every.
+    root is the (owner, attribute) of the function called once per tick, e.g. (Captain, "get_output").
+    """
+    global enabled, sample_every, _ring_counts, _ring_times
+    sample_every = max(int(every), 1)
+    if enabled:
+        return
+
+    targets = TARGETS + _extra + ([(root[0], root[1], "tick")] if root is not None else [])
+    for module, attribute, name in targets:
+        # Only modules the bot already imported, e.g. Primus has no policy package
+        owner = sys.modules.get(module) if isinstance(module, str) else module
+        *path, attribute = attribute.split(".")
+        for part in path:
+            owner = getattr(owner, part, None)
+        if owner is None or not hasattr(owner, attribute):
+            continue
+
+        index = _index(name)
+        owners = [owner] + (_subclasses(owner) if isinstance(owner, type) and name == "Play.step" else [])
+        for cls in owners:
+            if attribute in vars(cls):
+                original = vars(cls)[attribute]
+                setattr(cls, attribute, _wrap(original, index, commit=name == "tick"))
+                _patched.append((cls, attribute, original))
+
+    _ring_counts = np.zeros((RING_SIZE, len(names)), dtype=np.int64)
+    _ring_times = np.zeros((RING_SIZE, len(names)))
+    enabled = True
+
+
+def disable():
+    """Restore the original functions (the collected data stays until the next enable)"""
+    global enabled
+    for owner, attribute, original in reversed(_patched):
+        setattr(owner, attribute, original)
+    _patched.clear()
+    enabled = False
+
+
+def _index(name):
+    if name not in names:
+        names.append(name)
+        _counts.append(0)
+        _times.append(0.0)
+        _depth.append(0)
+    return names.index(name)
+
+
+def _subclasses(cls):
+    found = []
+    for subclass in cls.__subclasses__():
+        found += [subclass] + _subclasses(subclass)
+    return found
+
+
+def _wrap(function, index, commit=False):
+
+    def wrapper(*args, **kwargs):
+        global _thread
+        if commit:
+            _thread = threading.get_ident()
+        if not _sampling or _depth[index] or (_thread is not None and threading.get_ident() != _thread):
+            if commit:
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    _commit()
+            return function(*args, **kwargs)
+
+        _depth[index] += 1
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _times[index] += perf_counter() - start
+            _counts[index] += 1
+            _depth[index] -= 1
+            if commit:
+                _commit()
+
+    wrapper.__wrapped__ = function
+    wrapper.__name__ = getattr(function, "__name__", "wrapper")
+    wrapper.__doc__ = getattr(function, "__doc__", None)
+    return wrapper
+
+
+def _commit():
+    # End of a tick: store the sampled one in the ring and decide whether to time the next
+    global _sampling, _tick, _ring_ticks
+    if _sampling:
+        row = _ring_ticks % RING_SIZE
+        _ring_counts[row] = _counts
+        _ring_times[row] = _times
+        _ring_ticks += 1
+        for i in range(len(names)):
+            _counts[i] = 0
+            _times[i] = 0.0
+
+    _tick += 1
+    _sampling = _tick % sample_every == 0
+
+
+def snapshot(last=None):
+    """(counts, times) arrays of the sampled ticks in the ring, oldest first, shape (ticks, len(names))"""
+    if _ring_counts is None:
+        return np.zeros((0, len(names)), dtype=np.int64), np.zeros((0, len(names)))
+
+    filled = min(_ring_ticks, RING_SIZE)
+    order = (np.arange(filled) + _ring_ticks - filled) % RING_SIZE
+    if last is not None:
+        order = order[-last:]
+    return _ring_counts[order], _ring_times[order]
+
+
+def report(last=None) -> str:
+    counts, times = snapshot(last)
+    if len(counts) == 0:
+        return "No spans recorded"
+
+    ms = times * 1000
+    lines = [f"Spans over {len(counts)} sampled ticks (1 in {sample_every}), ms per tick:",
+             f"{'span':<20} {'calls':>7} {'mean':>8} {'p95':>8} {'max':>8} {'budget':>8}"]
+    for i in np.argsort(-ms.mean(axis=0)):
+        lines.append(f"{names[i]:<20} {counts[:, i].mean():>7.2f} {ms[:, i].mean():>8.3f} "
+                     f"{np.percentile(ms[:, i], 95):>8.3f} {ms[:, i].max():>8.3f} "
+                     f"{times[:, i].mean() / TICK_BUDGET * 100:>7.2f}%")
+    return "\n".join(lines)
+
+
+def dump(path):
+    """Save the per tick counts and times of the ring as JSON"""
+    counts, times = snapshot()
+    with open(path, "w") as file:
+        json.dump({"names": names, "sample_every": sample_every,
+                   "counts": counts.tolist(), "times": times.tolist()}, file)
+
+
+def draw(draw_tool, x=20, y=300, last=120):
+    """Overlay of the mean ms per tick of every span over the last sampled ticks, through a DrawingTool"""
+    counts, times = snapshot(last)
+    if len(counts) == 0:
+        return
+
+    draw_tool.color(draw_tool.white)
+    means = times.mean(axis=0) * 1000
+    for row, i in enumerate(np.argsort(-means)):
+        draw_tool.screen_string(x, y + 20 * row, f"{names[i]}: {means[i]:.2f} ms ({counts[:, i].mean():.1f})")